@@ -298,7 +298,12 @@ class MicroPythonREPLPane(QTextEdit):
     def send_commands(self, commands):
         """
         Send commands to the REPL via raw mode.
+
+        The commands may be a list of lines or a single string containing
+        the whole script.
         """
+        if isinstance(commands, str):
+            commands = commands.split('\n')
         raw_on = [  # Sequence of commands to get into raw mode.
             b'\x02',
             b'\r\x03',
@@ -317,6 +322,15 @@ class MicroPythonREPLPane(QTextEdit):
         logger.info(command_sequence)
         self.execute(command_sequence)
 
+    def send_bulk(self, payload):
+        """
+        Send the referenced bytes to the device in a single write, rather
+        than as a series of commands spread over the event loop.
+        """
+        logger.info(payload)
+        self.serial.write(payload)
+        self.serial.flush()
+
     def execute(self, commands):
         """
         Execute a series of commands over a period of time (scheduling
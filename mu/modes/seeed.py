@@ -1,1053 +1,1412 @@
-"""
-A mode for working with Seeed's line of  MicroPython boards.
-
-Copyright (c) 2015-2019 Nicholas H.Tollervey and others (see the AUTHORS file).
-
-This program is free software: you can redistribute it and/or modify
-it under the terms of the GNU General Public License as published by
-the Free Software Foundation, either version 3 of the License, or
-(at your option) any later version.
-
-This program is distributed in the hope that it will be useful,
-but WITHOUT ANY WARRANTY; without even the implied warranty of
-MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-GNU General Public License for more details.
-
-You should have received a copy of the GNU General Public License
-along with this program.  If not, see <http://www.gnu.org/licenses/>.
-"""
-import logging
-import time
-import json
-import datetime
-import os
-import platform
-import subprocess
-import shutil
-import zipfile
-import requests
-from mu.contrib.microfs import execute
-from mu.modes.api import SEEED_APIS, SHARED_APIS
-from mu.modes.base import MicroPythonMode, FileManager
-from mu.interface.panes import CHARTS, PANE_ZOOM_SIZES, \
-    MicroPythonDeviceFileList
-from mu.interface.themes import Font, DEFAULT_FONT_SIZE
-from mu.resources import load_icon, path
-from PyQt5.QtSerialPort import QSerialPort, QSerialPortInfo
-from PyQt5.QtCore import pyqtSignal, QThread, Qt
-from PyQt5.QtWidgets import QMessageBox, \
-    QMenu, QTreeWidget, QTreeWidgetItem, QAbstractItemView
-from PyQt5.QtWidgets import QGridLayout, QLabel, QFrame
-
-logger = logging.getLogger(__name__)
-
-
-class Info:
-    __stty = None
-    __config = None
-    has_firmware = False
-    board_normal = []
-    board_boot = []
-    dic_config = {}
-    com = None
-    board_id = None
-    board_name = None
-
-    def __init__(self):
-        inf = open(self.info_path, 'r')
-        inf = json.loads(inf.read())
-        self.lib_dic = {}
-        self.board_boot.clear()
-        self.board_normal.clear()
-        self.dic_config.clear()
-        fmt = 'config-%s.json'
-
-        for board in inf['boot']:
-            name = board['name']
-            pvid = board['pvid']
-            keyv = (pvid[0], pvid[1])
-            self.dic_config.setdefault(str(keyv), fmt % name)
-            self.board_boot.append(keyv)
-
-        for board in inf['normal']:
-            name = board['name']
-            pvid = board['pvid']
-            keyv = (pvid[0], pvid[1])
-            self.dic_config.setdefault(str(keyv), fmt % name)
-            self.board_normal.append(keyv)
-
-        inf = open(self.info_path, 'r')
-        inf = json.loads(inf.read())
-
-        for lib in inf['lib']:
-            self.lib_dic.setdefault(lib['name'], lib['version'])
-
-    def load_config(self):
-        file = open(self.config_path, 'r')
-        self.__config = json.loads(file.read())
-
-    @staticmethod
-    def path(child):
-        return path(child, 'seeed/')
-
-    @staticmethod
-    def path_tools(child):
-        if os.name == 'posix':
-            if platform.uname().system == 'Darwin':
-                return path(child, 'seeed/tools-darwin/')
-            return path(child, 'seeed/tools-linux/')
-        else:
-            return path(child, 'seeed/tools-win/')
-
-    @property
-    def cloud_config_path(self):
-        return 'https://seeed-studio.github.io/ArduPy/' + \
-            self.dic_config[self.board_id]
-
-    @property
-    def cloud_libaray_info_path(self):
-        return 'https://seeed-studio.github.io/ArduPy/libaray.json'
-
-    @property
-    def config_path(self):
-        return self.path(self.dic_config[self.board_id])
-
-    @property
-    def version(self):
-        return strptime(self.__config['firmware']['version'])
-
-    @property
-    def cloud_firmware(self):
-        return self.__config['firmware']['path']
-
-    @property
-    def local_firmware(self):
-        return self.path(self.__config['firmware']['name'])
-
-    @property
-    def firmware_name(self):
-        return self.__config['firmware']['name']
-
-    @property
-    def short_device_name(self):
-        if os.name == 'posix':
-            return self.board_name[self.board_name.rindex('/') + 1:]
-        else:
-            return self.board_name
-
-    @property
-    def bossac(self):
-        cmd = 'bossac.exe -i -d --port=%s -U true -i -e -w -v %s -R' \
-            % (self.short_device_name, self.local_firmware)
-        cmd = self.path_tools(cmd)
-        print(cmd)
-        return cmd
-
-    @property
-    def stty(self):
-        if os.name == 'posix':
-            if platform.uname().system == 'Darwin':
-                return 'stty -f ' + self.board_name + ' %d'
-            return 'stty -F ' + self.board_name + ' %d'
-        elif os.name == 'nt':
-            return 'MODE ' + self.board_name + ':BAUD=%d PARITY=N DATA=8'
-        return ['echo not support']
-
-    @property
-    def info_path(self):
-        return self.path('info.json')
-
-    @property
-    def libaray_info_path(self):
-        return self.path('libaray.json')
-
-
-class ConfirmFlag:
-    hint = None
-    confirm = None
-
-    @property
-    def is_confirm(self):
-        while self.confirm is None:
-            time.sleep(0.7)
-        return self.confirm
-
-
-class LocalFileTree(QTreeWidget):
-    put = pyqtSignal(str)
-    delete = pyqtSignal(str)
-    set_message = pyqtSignal(str)
-    open_file = pyqtSignal(str)
-    get = pyqtSignal(str, str)
-    list_files = pyqtSignal()
-    disable = pyqtSignal()
-    enable = pyqtSignal()
-    need_update_tree = True
-    info = None
-
-    def __build_list(self, control, parent_dir):
-        for _, dirnames, filesnames in os.walk(parent_dir):
-            dirnames.sort()
-            filesnames.sort()
-            for dir in dirnames:
-                item = QTreeWidgetItem(control)
-                item.setText(0, dir)
-                item.setIcon(0, self.__icon_folder)
-                item.name = dir
-                item.dir = parent_dir
-                item.is_file = False
-                self.__build_list(item, os.path.join(parent_dir, dir))
-            for file in filesnames:
-                item = QTreeWidgetItem(control)
-                item.setText(0, file)
-                item.setIcon(0, self.__icon_firmware)
-                item.name = file
-                item.dir = parent_dir
-                item.is_file = True
-            return
-
-    def __init__(self, home, parent=None):
-        super(LocalFileTree, self).__init__(parent)
-        self.home = home
-        self.setStyleSheet('border:1px solid darkgray;')
-        self.setAcceptDrops(True)
-        self.setDragDropMode(QAbstractItemView.InternalMove)
-        self.header().setVisible(False)
-        self.__icon_firmware = load_icon('firmware.png')
-        self.__icon_folder = load_icon('folder.png')
-
-    def ls(self):
-        self.__build_list(self, self.home)
-
-    def on_get(self, ardupy_file):
-        """
-        Fired when the get event is completed for the given filename.
-        """
-        msg = _("Successfully copied '{}' "
-                "from the ardupy to your computer.").format(ardupy_file)
-        self.set_message.emit(msg)
-        self.list_files.emit()
-
-    def on_put(self, ardupy_file):
-        """
-        Fired when the put event is completed for the given filename.
-        """
-        msg = _("'{}' successfully copied to ardupy.").format(ardupy_file)
-        self.set_message.emit(msg)
-        self.list_files.emit()
-
-    def contextMenuEvent(self, event):
-        cur = self.currentItem()
-        if cur.is_file:
-            hint_cant_delete = _("This Libaray file can't be deleted.")
-        else:
-            hint_cant_delete = _("This Libaray folder can't be deleted.")
-        while cur.parent() is not None:
-            cur = cur.parent()
-        name = cur.text(0)
-
-        for item in LocalFileTree.info.lib_dic.keys():
-            if os.path.splitext(item)[0] != name:
-                continue
-            menu = QMenu(self)
-            delete_action = menu.addAction(hint_cant_delete)
-            menu.exec_(self.mapToGlobal(event.pos()))
-            return
-
-        menu = QMenu(self)
-        delete_action = menu.addAction(_("Delete (cannot be undone)"))
-        action = menu.exec_(self.mapToGlobal(event.pos()))
-
-        if action == delete_action:
-            self.disable.emit()
-            item = self.currentItem()
-            path = os.path.join(item.dir, item.name)
-
-            if item.is_file:
-                os.remove(path)
-            else:
-                shutil.rmtree(path)
-            parent = item.parent() or self.invisibleRootItem()
-            parent.removeChild(item)
-            msg = "'%s' successfully deleted from local machine." % item.name
-            logger.info(msg)
-            self.set_message.emit(msg)
-            self.enable.emit()
-
-
-class ArdupyDeviceFileList(MicroPythonDeviceFileList):
-    info = None
-    serial = None
-
-    def __init__(self, home):
-        super().__init__(home)
-
-    def dropEvent(self, event):
-        source = event.source()
-        item = source.currentItem()
-
-        if not isinstance(source, LocalFileTree):
-            return
-        if not item.is_file:
-            msg = 'Not successfuly, current version just support copy file.'
-            logger.info(msg)
-            self.set_message.emit(msg)
-            return
-        source.need_update_tree = False
-        name = item.name
-        path = os.path.join(item.dir, name)
-
-        if not os.path.exists(path):
-            self.set_message.emit('Sorry, ' + name +
-                                  ' not exist in current folder, ' +
-                                  'place reopen file panel.')
-            return
-
-        if self.findItems(name, Qt.MatchExactly) and \
-                not self.show_confirm_overwrite_dialog():
-            return
-
-        try:
-            msg = execute([
-                'import os',
-                'print(os.statvfs(\'/\'), end=\'\')',
-            ], ArdupyDeviceFileList.serial)
-            msg = str(msg[0], 'utf-8')
-            print(msg)
-        except Exception as ex:
-            print(ex)
-            msg = "Fail! serial error."
-            self.set_message.emit(msg)
-            return
-
-        val = msg.split(', ')
-        avaliable_byte = int(val[1]) * int(val[4])
-        file_size = os.path.getsize(path)
-
-        if avaliable_byte > file_size:
-            msg = "Copying '%s' to seeed board." % name
-            self.disable.emit()
-            self.set_message.emit(msg)
-            self.put.emit(path)
-        else:
-            msg = "Fail! target device doesn't have enough space."
-            self.set_message.emit(msg)
-        logger.info(msg)
-
-
-class SeeedFileSystemPane(QFrame):
-    set_message = pyqtSignal(str)
-    set_warning = pyqtSignal(str)
-    list_files = pyqtSignal()
-    open_file = pyqtSignal(str)
-
-    def __init__(self, home):
-        super().__init__()
-        self.home = home
-        self.font = Font().load()
-        microbit_fs = ArdupyDeviceFileList(home)
-        local_fs = LocalFileTree(home)
-
-        @local_fs.open_file.connect
-        def on_open_file(file):
-            # Bubble the signal up
-            self.open_file.emit(file)
-
-        layout = QGridLayout()
-        self.setLayout(layout)
-        microbit_label = QLabel()
-        microbit_label.setText(_('Files on your device:'))
-        local_label = QLabel()
-        local_label.setText(_('Files on your computer:'))
-        self.microbit_label = microbit_label
-        self.local_label = local_label
-        self.microbit_fs = microbit_fs
-        self.local_fs = local_fs
-        self.set_font_size()
-        layout.addWidget(microbit_label, 0, 0)
-        layout.addWidget(local_label, 0, 1)
-        layout.addWidget(microbit_fs, 1, 0)
-        layout.addWidget(local_fs, 1, 1)
-        self.microbit_fs.disable.connect(self.disable)
-        self.microbit_fs.set_message.connect(self.show_message)
-        self.local_fs.disable.connect(self.disable)
-        self.local_fs.enable.connect(self.enable)
-        self.local_fs.set_message.connect(self.show_message)
-
-    def disable(self):
-        """
-        Stops interaction with the list widgets.
-        """
-        self.microbit_fs.setDisabled(True)
-        self.local_fs.setDisabled(True)
-        self.microbit_fs.setAcceptDrops(False)
-        self.local_fs.setAcceptDrops(False)
-
-    def enable(self):
-        """
-        Allows interaction with the list widgets.
-        """
-        self.microbit_fs.setDisabled(False)
-        self.local_fs.setDisabled(False)
-        self.microbit_fs.setAcceptDrops(True)
-        self.local_fs.setAcceptDrops(True)
-
-    def show_message(self, message):
-        """
-        Emits the set_message signal.
-        """
-        self.set_message.emit(message)
-
-    def show_warning(self, message):
-        """
-        Emits the set_warning signal.
-        """
-        self.set_warning.emit(message)
-
-    def on_ls(self, microbit_files):
-        """
-        Displays a list of the files on the seeed board.
-
-        Since listing files is always the final event in any interaction
-        between Mu and the seeed board, this enables the controls again for
-        further interactions to take place.
-        """
-        self.microbit_fs.clear()
-        for f in microbit_files:
-            self.microbit_fs.addItem(f)
-
-        if self.local_fs.need_update_tree:
-            self.local_fs.clear()
-            self.local_fs.ls()
-        else:
-            self.local_fs.need_update_tree = True
-        self.enable()
-
-    def on_ls_fail(self):
-        """
-        Fired when listing files fails.
-        """
-        self.show_warning(_("There was a problem getting the list of files on "
-                            "the device. Please check Mu's logs for "
-                            "technical information. Alternatively, try "
-                            "unplugging/plugging-in your device and/or "
-                            "restarting Mu."))
-        self.disable()
-
-    def on_put_fail(self, filename):
-        """
-        Fired when the referenced file cannot be copied onto the device.
-        """
-        self.show_warning(_("There was a problem copying the file '{}' onto "
-                            "the device. Please check Mu's logs for "
-                            "more information.").format(filename))
-
-    def on_delete_fail(self, filename):
-        """
-        Fired when a deletion on the device for the given file failed.
-        """
-        self.show_warning(_("There was a problem deleting '{}' from the "
-                            "device. Please check Mu's logs for "
-                            "more information.").format(filename))
-
-    def on_get_fail(self, filename):
-        """
-        Fired when getting the referenced file on the device failed.
-        """
-        self.show_warning(_("There was a problem getting '{}' from the "
-                            "device. Please check Mu's logs for "
-                            "more information.").format(filename))
-
-    def set_theme(self, theme):
-        pass
-
-    def set_font_size(self, new_size=DEFAULT_FONT_SIZE):
-        """
-        Sets the font size for all the textual elements in this pane.
-        """
-        self.font.setPointSize(new_size)
-        self.microbit_label.setFont(self.font)
-        self.local_label.setFont(self.font)
-        self.microbit_fs.setFont(self.font)
-        self.local_fs.setFont(self.font)
-
-    def set_zoom(self, size):
-        """
-        Set the current zoom level given the "t-shirt" size.
-        """
-        self.set_font_size(PANE_ZOOM_SIZES[size])
-
-
-def strptime(value):
-    return datetime.datetime.strptime(value, '%Y-%m-%d')
-
-
-def download(des_path, source_path, timeout=5, try_time=3):
-    tmp = des_path + '.tmp'
-
-    for i in range(0, try_time):
-        try:
-            if os.path.exists(tmp):
-                os.remove(tmp)
-            get = requests.get(source_path)
-            get.raise_for_status()
-            file = open(tmp, 'wb')
-            for block in get.iter_content(16 * 1024):
-                file.write(block)
-            file.close()
-            shutil.move(tmp, des_path)
-            print("finish download.")
-            return True
-        except Exception as ex:
-            print(ex)
-    return False
-
-
-class FirmwareUpdater(QThread):
-    show_status = pyqtSignal(str, float)
-    confirm = pyqtSignal(ConfirmFlag)
-    show_message_box = pyqtSignal(str)
-    set_all_button = pyqtSignal(bool)
-    detected = False
-    in_bootload_mode = False
-    need_confirm = True
-    hint_flashing = 'Flashing...'
-    hint_flashing_success = 'Flashing success.'
-    hint_flashing_fail = 'Flashing fail.'
-
-    def __init__(
-            self,
-            mu_code_path,
-            confirm,
-            show_status,
-            show_message_box,
-            set_all_button,
-            parent=None):
-        super(FirmwareUpdater, self).__init__(parent)
-        self.mu_code_path = mu_code_path
-        self.confirm.connect(confirm)
-        self.show_status.connect(show_status)
-        self.show_message_box.connect(show_message_box)
-        self.set_all_button.connect(set_all_button)
-
-    def run(self):
-        self.update_lib()
-        while True:
-            while not self.detected:
-                time.sleep(1)
-            self.update()
-            self.detected = False
-
-    def show_status_short_time(self, msg):
-        self.show_status.emit(msg, 5)
-
-    def show_status_always(self, msg):
-        self.show_status.emit(msg, 1000 * 1000)
-
-    def update_lib(self):
-        self.extract()
-        if not download(self.info.libaray_info_path,
-                        self.info.cloud_libaray_info_path):
-            print('network error')
-            return
-
-        lib = open(self.info.libaray_info_path, 'r')
-        inf = open(self.info.info_path, 'r')
-        lib = json.loads(lib.read())
-        inf = json.loads(inf.read())
-        network_error = 'libaray update failure, please check your network.'
-        has_new = False
-
-        # check new
-        for new in lib:
-            need_download = True
-            new_nam = new['name']
-            new_ver = new['version']
-
-            if new_nam not in self.info.lib_dic.keys():
-                self.show_status_always('downloading %s...' % new_nam)
-            elif strptime(new_ver) > strptime(self.info.lib_dic[new_nam]):
-                self.show_status_always('updating %s...' % new_nam)
-            else:
-                need_download = False
-            if not need_download:
-                continue
-            if not download(self.info.path(new_nam), new['path'], timeout=16):
-                self.show_status_short_time(network_error)
-                return
-
-            self.show_status_always('extracting %s...' % new_nam)
-
-            if not self.unzip(new_nam):
-                self.show_status_short_time('%s extract failure' % new_nam)
-                return
-            has_new = True
-
-        if not has_new:
-            return
-
-        inf['lib'] = lib
-
-        with open(self.info.info_path, 'w') as f:
-            json.dump(inf, f)
-            print('lib has been updated successfully!')
-        self.show_status_short_time('libaray update successfully!')
-
-    def extract(self):
-        # extract to mu_code dir
-        inf = open(self.info.info_path, 'r')
-        inf = json.loads(inf.read())
-        for lib in inf['lib']:
-            self.unzip(lib['name'])
-
-    def unzip(self, lib_zip_name):
-        lib_path_zip = self.info.path(lib_zip_name)
-        lib_path_mu_code = os.path.join(
-            self.mu_code_path,
-            lib_zip_name.replace('.zip', '')
-        )
-
-        print('mu_code =', lib_path_mu_code)
-        print('lib_path_zip =', lib_path_zip)
-
-        try:
-            if not os.path.exists(lib_path_mu_code):
-                zf = zipfile.ZipFile(lib_path_zip, 'r')
-                for f in zf.namelist():
-                    zf.extract(f, lib_path_mu_code)
-                print('unzip circuitpython-bundle to mu_code dir')
-            return True
-        except Exception as ex:
-            if os.path.exists(lib_path_mu_code):
-                shutil.rmtree(lib_path_mu_code)
-            print(ex)
-            return False
-
-    def flashing(self):
-        sp = subprocess.Popen(self.info.bossac, shell=True)
-        sp.wait()
-        return sp.returncode == 0
-
-    def on_put(self, file):
-        msg = "'%s' successfully copied to seeed board." % file
-        self.set_message.emit(msg)
-        self.list_files.emit()
-
-    def on_delete(self, file):
-        msg = "'%s' successfully deleted from seeed board." % file
-        self.set_message.emit(msg)
-        self.list_files.emit()
-
-    def download_to_board(
-            self,
-            new_version,
-            need_update=True,
-            has_seeed_firmware=False):
-        if self.need_confirm:
-            flag = ConfirmFlag()
-            if has_seeed_firmware:
-                flag.hint = 'there is a new available firmware, ' + \
-                    'would you like to update it to you board ?'
-            elif self.in_bootload_mode:
-                flag.hint = 'your board on bootload download mode, ' + \
-                    'would you like to flashing a firmware ?'
-            else:
-                flag.hint = 'there is no firmware in your board, ' + \
-                    'would you like to flashing a firmware ?'
-            self.confirm.emit(flag)
-
-            if not flag.is_confirm:
-                return
-        elif not self.in_bootload_mode:
-            self.set_all_button.emit(True)
-            return
-        else:
-            self.need_confirm = True
-
-        self.set_all_button.emit(False)
-
-        if not self.in_bootload_mode:
-            print('setting baud rate...')
-            subprocess.call(self.info.stty % 1200, shell=True)
-            self.need_confirm = False
-            return
-
-        self.show_status_always(self.hint_flashing)
-        if self.flashing():
-            version = 'your board update to version %d.%d.%d sucessfully!' % \
-                (new_version.year, new_version.month, new_version.day)
-            self.show_message_box.emit(version)
-            self.show_status_short_time(self.hint_flashing_success)
-            self.has_firmware = True
-        else:
-            self.show_status_short_time(self.hint_flashing_fail)
-            self.show_status_short_time('flashing fail.')
-        self.set_all_button.emit(True)
-
-    def update(self):
-        need_update = True
-        has_seeed_firmware = True
-
-        if self.need_confirm:
-            print("download config.")
-            if os.path.exists(self.info.config_path):
-                self.info.load_config()
-                old_version = self.info.version
-            else:
-                old_version = datetime.datetime(2000, 1, 1)
-
-            if download(self.info.config_path,
-                        self.info.cloud_config_path):
-                print('finished download')
-                self.info.load_config()
-                new_version = self.info.version
-
-                if old_version < new_version and \
-                        not os.path.exists(self.info.local_firmware):
-                    print("download firmware.")
-                    success = download(
-                        self.info.local_firmware,
-                        self.info.cloud_firmware,
-                        timeout=16
-                    )
-                    if not success:
-                        print("download failure.")
-                    else:
-                        print("finish download.")
-            else:
-                new_version = old_version
-        else:
-            self.info.load_config()
-            new_version = self.info.version
-
-        if self.in_bootload_mode:
-            self.download_to_board(new_version)
-            return
-
-        for i in range(3):
-            com = QSerialPort()
-            com.setBaudRate(115200)
-            com.setPortName(self.info.board_name)
-            if not com.open(QSerialPort.ReadWrite):
-                print("can't open com, waiting...")
-                time.sleep(5)
-                continue
-            buf = bytearray()
-            com.write(b'\x03')
-            com.write(b'\x03')
-            com.write(b'\x02')
-            while com.waitForReadyRead(400) and len(buf) < 200:
-                buf = buf + com.readAll()
-            try:
-                tmp = str(buf, 'utf-8')
-                print(tmp)
-                r = tmp.index('; Ardupy with seeed')
-                ver = tmp[r - 10:r]
-                need_update = new_version > strptime(ver)
-                print(ver)
-                self.info.has_firmware = True
-            except Exception as ex:
-                print(ex)
-                has_seeed_firmware = False
-            if com.isOpen():
-                com.close()
-                print('com close')
-            if not need_update:
-                print('has latest firmware.')
-            else:
-                self.download_to_board(
-                    new_version,
-                    need_update,
-                    has_seeed_firmware)
-            return
-        print("giveup")
-
-
-class SeeedMode(MicroPythonMode):
-    """
-    Represents the functionality required for running MicroPython on Seeed's
-    line of boards
-    """
-    name = _('Seeed MicroPython')
-    description = _("Use MicroPython on Seeed's line of boards.")
-    icon = 'seeed'
-    fs = None
-    info = Info()
-    # There are many boards which use ESP microcontrollers but they often use
-    # the same USB / serial chips (which actually define the Vendor ID and
-    # Product ID for the connected devices.
-
-    # VID  , PID
-    valid_boards = info.board_normal + info.board_boot
-
-    def __init__(self, editor, view):
-        super().__init__(editor, view)
-        self.invoke = FirmwareUpdater(
-            mu_code_path=super().workspace_dir(),  # mu_code/
-            confirm=self.__confirm,
-            show_status=self.editor.show_status_message,
-            show_message_box=self.__show_message_box,
-            set_all_button=self.__set_all_button
-        )
-        self.invoke.info = SeeedMode.info
-        self.invoke.start()
-        self.view.default_pane = SeeedFileSystemPane
-        ArdupyDeviceFileList.info = SeeedMode.info
-        LocalFileTree.info = SeeedMode.info
-        editor.detect_new_device_handle = \
-            self.__asyc_detect_new_device_handle
-
-    def __set_all_button(self, state):
-        print('button Enable=' + str(state))
-        self.set_buttons(files=state, run=state, repl=state, plotter=state)
-
-    def __confirm(self, flag):
-        flag.confirm = QMessageBox.Ok == \
-            self.view.show_confirmation(flag.hint, icon='Question')
-
-    def __show_message_box(self, text):
-        self.msg = QMessageBox()
-        self.msg.setWindowTitle('Hint')
-        self.msg.setDefaultButton(self.msg.Ok)
-        self.msg.setText(text)
-        self.msg.show()
-
-    def __asyc_detect_new_device_handle(self, device_name):
-        self.info.has_firmware = False
-        self.info.board_id = None
-        self.info.board_name = device_name
-        available_ports = QSerialPortInfo.availablePorts()
-
-        def match(pvid, ids):
-            for valid in ids:
-                if pvid == valid:
-                    self.info.board_id = str(valid)
-                    return True
-            return False
-
-        for port in available_ports:
-            pvid = (
-                port.vendorIdentifier(),
-                port.productIdentifier()
-            )
-            if match(pvid, self.info.board_normal):
-                self.invoke.in_bootload_mode = False
-                print('detect a normal mode borad')
-                break
-            if match(pvid, self.info.board_boot):
-                self.invoke.in_bootload_mode = True
-                print('detect a bootload mode borad')
-                break
-
-        self.invoke.detected = True
-
-    def actions(self):
-        """
-        Return an ordered list of actions provided by this module. An action
-        is a name (also used to identify the icon) , description, and handler.
-        """
-        buttons = [
-            {
-                'name': 'run',
-                'display_name': _('Run'),
-                'description': _("Run your code directly on the Seeed's"
-                                 " line of boards. via the REPL."),
-                'handler': self.run,
-                'shortcut': 'F5',
-            },
-            {
-                'name': 'files',
-                'display_name': _('Files'),
-                'description': _("Access the file system on "
-                                 "Seeed's line of boards."),
-                'handler': self.toggle_files,
-                'shortcut': 'F4',
-            },
-            {
-                'name': 'repl',
-                'display_name': _('REPL'),
-                'description': _("Use the REPL to live-code on the "
-                                 "Seeed's line of boards."),
-                'handler': self.toggle_repl,
-                'shortcut': 'Ctrl+Shift+I',
-            }, ]
-        if CHARTS:
-            buttons.append({
-                'name': 'plotter',
-                'display_name': _('Plotter'),
-                'description': _('Plot incoming REPL data.'),
-                'handler': self.toggle_plotter,
-                'shortcut': 'CTRL+Shift+P',
-            })
-        return buttons
-
-    def api(self):
-        """
-        Return a list of API specifications to be used by auto-suggest and call
-        tips.
-        """
-        return SHARED_APIS + SEEED_APIS
-
-    def check_firmware_existence(self):
-        hint = 'denit! please make sure your board connected to ' + \
-            'the computer and there is a Ardupy firmware in your board.'
-        if self.info.has_firmware:
-            return True
-        self.__show_message_box(hint)
-        return False
-
-    def toggle_repl(self, event):
-        if not self.check_firmware_existence():
-            return
-        if self.fs is None:
-            if self.repl:
-                # Remove REPL
-                super().toggle_repl(event)
-                self.set_buttons(files=True)
-            elif not (self.repl):
-                # Add REPL
-                super().toggle_repl(event)
-                if self.repl:
-                    self.set_buttons(files=False)
-        else:
-            message = _("REPL and file system cannot work at the same time.")
-            information = _("The REPL and file system both use the same USB "
-                            "serial connection. Only one can be active "
-                            "at any time. Toggle the file system off and "
-                            "try again.")
-            self.view.show_message(message, information)
-
-    def toggle_plotter(self, event):
-        """
-        Check for the existence of the file pane before toggling plotter.
-        """
-        if not self.check_firmware_existence():
-            return
-        if self.fs is None:
-            super().toggle_plotter(event)
-            if self.plotter:
-                self.set_buttons(files=False)
-            elif not (self.repl or self.plotter):
-                self.set_buttons(files=True)
-        else:
-            message = _("The plotter and file system cannot work at the same "
-                        "time.")
-            information = _("The plotter and file system both use the same "
-                            "USB serial connection. Only one can be active "
-                            "at any time. Toggle the file system off and "
-                            "try again.")
-            self.view.show_message(message, information)
-
-    def run(self):
-        """
-        Takes the currently active tab, compiles the Python script therein into
-        a hex file and flashes it all onto the connected device.
-        """
-        """
-        if self.repl:
-            message = _("Flashing cannot be performed at the same time as the "
-                        "REPL is active.")
-            information = _("File transfers use the same "
-                            "USB serial connection as the REPL. Toggle the "
-                            "REPL off and try again.")
-            self.view.show_message(message, information)
-            return
-        """
-        logger.info('Running script.')
-        # Grab the Python script.
-        tab = self.view.current_tab
-        if tab is None:
-            # There is no active text editor.
-            message = _("Cannot run anything without any active editor tabs.")
-            information = _("Running transfers the content of the current tab"
-                            " onto the device. It seems like you don't have "
-                            " any tabs open.")
-            self.view.show_message(message, information)
-            return
-        python_script = tab.text().split('\n')
-        if not self.repl:
-            self.toggle_repl(None)
-        if self.repl:
-            self.view.repl_pane.send_commands(python_script)
-
-    def toggle_files(self, event):
-        """
-        Check for the existence of the REPL or plotter before toggling the file
-        system navigator for the MicroPython device on or off.
-        """
-        if not self.check_firmware_existence():
-            return
-        if self.repl:
-            message = _("File system cannot work at the same time as the "
-                        "REPL or plotter.")
-            information = _("The file system and the REPL and plotter "
-                            "use the same USB serial connection. Toggle the "
-                            "REPL and plotter off and try again.")
-            self.view.show_message(message, information)
-        else:
-            if self.fs is None:
-                self.add_fs()
-                if self.fs:
-                    logger.info('Toggle filesystem on.')
-                    self.set_buttons(run=False, repl=False, plotter=False)
-            else:
-                self.remove_fs()
-                logger.info('Toggle filesystem off.')
-                self.set_buttons(run=True, repl=True, plotter=True)
-
-    def add_fs(self):
-        """
-        Add the file system navigator to the UI.
-        """
-
-        # Find serial port boards is connected to
-        device_port, serial_number = self.find_device()
-
-        # Check for MicroPython device
-        if not device_port:
-            message = _("Could not find an attached Seeed's line of boards.")
-            information = _("Please make sure the device is plugged "
-                            "into this computer.\n\nThe device must "
-                            "have MicroPython flashed onto it before "
-                            "the file system will work.\n\n"
-                            "Finally, press the device's reset button "
-                            "and wait a few seconds before trying "
-                            "again.")
-            self.view.show_message(message, information)
-            return
-
-        def on_start():
-            self.file_manager.on_start()
-            try:
-                ArdupyDeviceFileList.serial = self.file_manager.serial
-            except Exception as ex:
-                print(ex)
-
-        self.file_manager_thread = QThread(self)
-        self.file_manager = FileManager(device_port)
-        self.file_manager.moveToThread(self.file_manager_thread)
-        self.file_manager_thread.started.connect(on_start)
-        self.fs = self.view.add_filesystem(self.workspace_dir(),
-                                           self.file_manager,
-                                           _("Seeed's line of boards"))
-        self.fs.set_message.connect(self.editor.show_status_message)
-        self.fs.set_warning.connect(self.view.show_message)
-        self.file_manager_thread.start()
-
-    def remove_fs(self):
-        """
-        Remove the file system navigator from the UI.
-        """
-        self.view.remove_filesystem()
-        self.file_manager = None
-        self.file_manager_thread = None
-        self.fs = None
-        ArdupyDeviceFileList.serial = None
-
-    def on_data_flood(self):
-        """
-        Ensure the Files button is active before the REPL is killed off when
-        a data flood of the plotter is detected.
-        """
-        self.set_buttons(files=True)
-        super().on_data_flood()
+"""
+A mode for working with Seeed's line of  MicroPython boards.
+
+Copyright (c) 2015-2019 Nicholas H.Tollervey and others (see the AUTHORS file).
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import logging
+import threading
+import time
+import json
+import datetime
+import functools
+import hashlib
+import os
+import platform
+import subprocess
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from mu.contrib.microfs import execute
+from mu.modes.api import SEEED_APIS, SHARED_APIS
+from mu.modes.base import MicroPythonMode, FileManager
+from mu.interface.panes import CHARTS, PANE_ZOOM_SIZES, \
+    MicroPythonDeviceFileList
+from mu.interface.themes import Font, DEFAULT_FONT_SIZE
+from mu.resources import load_icon, path
+from PyQt5.QtSerialPort import QSerialPort, QSerialPortInfo
+from PyQt5.QtCore import pyqtSignal, QThread, Qt, QFileInfo, QEventLoop, \
+    QTimer
+from PyQt5.QtWidgets import QMessageBox, QMenu, QTreeView, \
+    QAbstractItemView, QFileSystemModel, QFileIconProvider
+from PyQt5.QtWidgets import QGridLayout, QLabel, QFrame, QApplication
+
+logger = logging.getLogger(__name__)
+
+
+# All downloads share one session so the connections to the Seeed servers
+# are kept alive and reused rather than set up again for every file.
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+
+def http_session():
+    """
+    Return the shared requests session. requests (and the ssl and urllib3
+    modules it pulls in) is only imported the first time a download runs.
+    """
+    global _HTTP_SESSION
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_connections=4,
+                                                  pool_maxsize=4))
+            _HTTP_SESSION = session
+    return _HTTP_SESSION
+
+
+try:  # pragma: no cover
+    import orjson
+
+    def json_loads(data):
+        """
+        Decode the referenced JSON bytes.
+        """
+        return orjson.loads(data)
+
+    def json_dumps(obj):
+        """
+        Encode the referenced object as JSON bytes.
+        """
+        return orjson.dumps(obj)
+except ImportError:  # pragma: no cover
+    logger.info('Unable to find orjson. Falling back to the json module.')
+
+    def json_loads(data):
+        """
+        Decode the referenced JSON bytes.
+        """
+        return json.loads(data.decode('utf-8'))
+
+    def json_dumps(obj):
+        """
+        Encode the referenced object as JSON bytes.
+        """
+        return json.dumps(obj).encode('utf-8')
+
+
+def load_boards(info_path):
+    """
+    Parse the referenced info.json and return the parsed dict together with
+    the tables built from it: the boot and normal mode (VID, PID) tuples,
+    the (VID, PID) to mode kind ('boot' or 'normal') and to config file
+    name mappings, and the library name to version mapping.
+    """
+    with open(info_path, 'rb') as f:
+        inf = json_loads(f.read())
+    dic_config = {}
+    fmt = 'config-%s.json'
+
+    for board in inf['boot'] + inf['normal']:
+        pvid = board['pvid']
+        dic_config.setdefault((pvid[0], pvid[1]), fmt % board['name'])
+
+    board_boot = tuple((b['pvid'][0], b['pvid'][1]) for b in inf['boot'])
+    board_normal = tuple((b['pvid'][0], b['pvid'][1]) for b in inf['normal'])
+    # Which mode a board is in, by (VID, PID). Normal mode wins should a
+    # pair ever be listed as both.
+    board_kind = dict.fromkeys(board_boot, 'boot')
+    board_kind.update(dict.fromkeys(board_normal, 'normal'))
+    lib_dic = {}
+    for lib in inf['lib']:
+        lib_dic.setdefault(lib['name'], lib['version'])
+    return inf, board_boot, board_normal, board_kind, dic_config, lib_dic
+
+
+# The result of load_boards() keyed by the path and modification time of
+# info.json, so an unchanged file is only parsed once.
+INFO_CACHE = {}
+
+
+class Info:
+    __stty = None
+    __config = None
+    __config_key = None
+    __version = None
+    has_firmware = False
+    com = None
+    board_id = None
+    board_name = None
+
+    def __init__(self):
+        # The platform never changes while Mu runs, so work out the tools
+        # folder, bossac executable and stty command line once.
+        self._is_posix = os.name == 'posix'
+        self._is_darwin = self._is_posix and \
+            platform.uname().system == 'Darwin'
+        if self._is_darwin:
+            self.__tools = 'seeed/tools-darwin/'
+            self.__bossac = 'bossac'
+            self.__stty = ['stty', '-f', '%(port)s', '%(baud)d']
+        elif self._is_posix:
+            self.__tools = 'seeed/tools-linux/'
+            self.__bossac = 'bossac'
+            self.__stty = ['stty', '-F', '%(port)s', '%(baud)d']
+        else:
+            self.__tools = 'seeed/tools-win/'
+            self.__bossac = 'bossac.exe'
+            if os.name == 'nt':
+                # MODE is run through cmd as there is no MODE.exe to start.
+                self.__stty = ['cmd', '/c', 'MODE', '%(port)s:BAUD=%(baud)d',
+                               'PARITY=N', 'DATA=8']
+
+        self.load_info()
+
+    def load_info(self, reload=False):
+        """
+        Bind the tables built from info.json, parsing it only if it has
+        changed on disk since the last parse or reload is set.
+        """
+        key = (self.info_path, os.stat(self.info_path).st_mtime)
+        if reload or key not in INFO_CACHE:
+            INFO_CACHE.clear()
+            INFO_CACHE[key] = load_boards(self.info_path)
+        # The tables are shared between instances and never modified.
+        self._info_cache, self.board_boot, self.board_normal, \
+            self.board_kind, self.dic_config, self.lib_dic = INFO_CACHE[key]
+        self.lib_name_set = {os.path.splitext(k)[0] for k in self.lib_dic}
+
+    def load_config(self):
+        # Only parse the config again if the file has changed on disk.
+        stat = os.stat(self.config_path)
+        key = (self.config_path, stat.st_mtime_ns, stat.st_size)
+        if self.__config is not None and key == self.__config_key:
+            return
+        with open(self.config_path, 'rb') as f:
+            self.__config = json_loads(f.read())
+        self.__config_key = key
+        self.__version = strptime(self.__config['firmware']['version'])
+
+    @staticmethod
+    def path(child):
+        return path(child, 'seeed/')
+
+    def path_tools(self, child):
+        return path(child, self.__tools)
+
+    @property
+    def cloud_config_path(self):
+        return 'https://seeed-studio.github.io/ArduPy/' + \
+            self.dic_config[self.board_id]
+
+    @property
+    def cloud_libaray_info_path(self):
+        return 'https://seeed-studio.github.io/ArduPy/libaray.json'
+
+    @property
+    def config_path(self):
+        return self.path(self.dic_config[self.board_id])
+
+    @property
+    def version(self):
+        return self.__version
+
+    @property
+    def cloud_firmware(self):
+        return self.__config['firmware']['path']
+
+    @property
+    def local_firmware(self):
+        return self.path(self.__config['firmware']['name'])
+
+    @property
+    def firmware_sha256(self):
+        return self.__config['firmware'].get('sha256')
+
+    @property
+    def firmware_name(self):
+        return self.__config['firmware']['name']
+
+    @property
+    def short_device_name(self):
+        if self._is_posix:
+            return self.board_name.rpartition('/')[2]
+        return self.board_name
+
+    @property
+    def bossac_argv(self):
+        argv = [
+            self.path_tools(self.__bossac), '-i', '-d',
+            '--port=%s' % self.short_device_name, '-U', 'true', '-i', '-e',
+            '-w', '-v', self.local_firmware, '-R'
+        ]
+        logger.info(argv)
+        return argv
+
+    def stty_argv(self, baud):
+        if self.__stty is None:
+            return None
+        values = {'port': self.board_name, 'baud': baud}
+        return [arg % values for arg in self.__stty]
+
+    @property
+    def info_path(self):
+        return self.path('info.json')
+
+
+class ConfirmFlag:
+    hint = None
+
+    def __init__(self):
+        self.__confirm = None
+        self.__answered = threading.Event()
+
+    @property
+    def confirm(self):
+        return self.__confirm
+
+    @confirm.setter
+    def confirm(self, value):
+        self.__confirm = value
+        self.__answered.set()
+
+    @property
+    def is_confirm(self):
+        self.__answered.wait()
+        return self.__confirm
+
+
+class LocalFileIconProvider(QFileIconProvider):
+    """
+    Supplies the folder and firmware icons shown in the local file tree.
+    """
+
+    # Shared by every provider and only loaded from disk once.
+    _ICON_FIRMWARE = None
+    _ICON_FOLDER = None
+
+    @classmethod
+    def _ensure_icons(cls):
+        if cls._ICON_FIRMWARE is None:
+            cls._ICON_FIRMWARE = load_icon('firmware.png')
+            cls._ICON_FOLDER = load_icon('folder.png')
+
+    def __init__(self):
+        super().__init__()
+        self._ensure_icons()
+
+    def icon(self, info):
+        if not isinstance(info, QFileInfo):
+            return super().icon(info)
+        if info.isDir():
+            return LocalFileIconProvider._ICON_FOLDER
+        return LocalFileIconProvider._ICON_FIRMWARE
+
+
+class LocalFileTree(QTreeView):
+    put = pyqtSignal(str)
+    delete = pyqtSignal(str)
+    set_message = pyqtSignal(str)
+    open_file = pyqtSignal(str)
+    get = pyqtSignal(str, str)
+    list_files = pyqtSignal()
+    disable = pyqtSignal()
+    enable = pyqtSignal()
+    info = None
+
+    def __init__(self, home, parent=None):
+        super(LocalFileTree, self).__init__(parent)
+        self.home = home
+        self.setStyleSheet('border:1px solid darkgray;')
+        self.setDragDropMode(QAbstractItemView.DragOnly)
+        self.header().setVisible(False)
+        # The model lists folders lazily on a worker thread and keeps
+        # itself up to date with changes on disk.
+        self.__icon_provider = LocalFileIconProvider()
+        self._model = QFileSystemModel(self)
+        self._model.setIconProvider(self.__icon_provider)
+        self._model.setRootPath(home)
+        self.setModel(self._model)
+        self.setRootIndex(self._model.index(home))
+        # Only the name column is of interest.
+        for column in range(1, self._model.columnCount()):
+            self.hideColumn(column)
+
+    def on_get(self, ardupy_file):
+        """
+        Fired when the get event is completed for the given filename.
+        """
+        msg = _("Successfully copied '{}' "
+                "from the ardupy to your computer.").format(ardupy_file)
+        self.set_message.emit(msg)
+        self.list_files.emit()
+
+    def on_put(self, ardupy_file):
+        """
+        Fired when the put event is completed for the given filename.
+        """
+        msg = _("'{}' successfully copied to ardupy.").format(ardupy_file)
+        self.set_message.emit(msg)
+        self.list_files.emit()
+
+    def contextMenuEvent(self, event):
+        index = self.currentIndex()
+        if not index.isValid():
+            return
+        if self._model.isDir(index):
+            hint_cant_delete = _("This Libaray folder can't be deleted.")
+        else:
+            hint_cant_delete = _("This Libaray file can't be deleted.")
+        top = index
+        while top.parent() != self.rootIndex():
+            top = top.parent()
+        name = self._model.fileName(top)
+
+        if name in LocalFileTree.info.lib_name_set:
+            menu = QMenu(self)
+            delete_action = menu.addAction(hint_cant_delete)
+            menu.exec_(self.mapToGlobal(event.pos()))
+            return
+
+        menu = QMenu(self)
+        delete_action = menu.addAction(_("Delete (cannot be undone)"))
+        action = menu.exec_(self.mapToGlobal(event.pos()))
+
+        if action == delete_action:
+            self.disable.emit()
+            path = self._model.filePath(index)
+
+            # The model notices the removal and updates the tree itself.
+            if self._model.isDir(index):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+            msg = "'%s' successfully deleted from local machine." % \
+                os.path.basename(path)
+            logger.info(msg)
+            self.set_message.emit(msg)
+            self.enable.emit()
+
+
+class ArdupyDeviceFileList(MicroPythonDeviceFileList):
+
+    def __init__(self, home):
+        super().__init__(home)
+
+    def mimeTypes(self):
+        # Files dragged out of the local file tree arrive as urls.
+        return super().mimeTypes() + ['text/uri-list']
+
+    def dropEvent(self, event):
+        source = event.source()
+
+        if not isinstance(source, LocalFileTree):
+            return
+        index = source.currentIndex()
+        if source.model().isDir(index):
+            msg = 'Not successfuly, current version just support copy file.'
+            logger.info(msg)
+            self.set_message.emit(msg)
+            return
+        path = source.model().filePath(index)
+        name = os.path.basename(path)
+
+        if not os.path.exists(path):
+            self.set_message.emit('Sorry, ' + name +
+                                  ' not exist in current folder, ' +
+                                  'place reopen file panel.')
+            return
+
+        if self.findItems(name, Qt.MatchExactly) and \
+                not self.show_confirm_overwrite_dialog():
+            return
+
+        # The free space check needs the serial connection, so it is left
+        # to the file manager's thread to keep the UI responsive.
+        msg = "Copying '%s' to seeed board." % name
+        self.disable.emit()
+        self.set_message.emit(msg)
+        self.put.emit(path)
+        logger.info(msg)
+
+
+class SeeedFileSystemPane(QFrame):
+    set_message = pyqtSignal(str)
+    set_warning = pyqtSignal(str)
+    list_files = pyqtSignal()
+    open_file = pyqtSignal(str)
+
+    def __init__(self, home):
+        super().__init__()
+        self.home = home
+        self.font = Font().load()
+        microbit_fs = ArdupyDeviceFileList(home)
+        local_fs = LocalFileTree(home)
+
+        @local_fs.open_file.connect
+        def on_open_file(file):
+            # Bubble the signal up
+            self.open_file.emit(file)
+
+        layout = QGridLayout()
+        self.setLayout(layout)
+        microbit_label = QLabel()
+        microbit_label.setText(_('Files on your device:'))
+        local_label = QLabel()
+        local_label.setText(_('Files on your computer:'))
+        self.microbit_label = microbit_label
+        self.local_label = local_label
+        self.microbit_fs = microbit_fs
+        self.local_fs = local_fs
+        self.set_font_size()
+        layout.addWidget(microbit_label, 0, 0)
+        layout.addWidget(local_label, 0, 1)
+        layout.addWidget(microbit_fs, 1, 0)
+        layout.addWidget(local_fs, 1, 1)
+        self.microbit_fs.disable.connect(self.disable)
+        self.microbit_fs.set_message.connect(self.show_message)
+        self.local_fs.disable.connect(self.disable)
+        self.local_fs.enable.connect(self.enable)
+        self.local_fs.set_message.connect(self.show_message)
+
+    def disable(self):
+        """
+        Stops interaction with the list widgets.
+        """
+        self.microbit_fs.setDisabled(True)
+        self.local_fs.setDisabled(True)
+        self.microbit_fs.setAcceptDrops(False)
+        self.local_fs.setAcceptDrops(False)
+
+    def enable(self):
+        """
+        Allows interaction with the list widgets.
+        """
+        self.microbit_fs.setDisabled(False)
+        self.local_fs.setDisabled(False)
+        self.microbit_fs.setAcceptDrops(True)
+        self.local_fs.setAcceptDrops(True)
+
+    def show_message(self, message):
+        """
+        Emits the set_message signal.
+        """
+        self.set_message.emit(message)
+
+    def show_warning(self, message):
+        """
+        Emits the set_warning signal.
+        """
+        self.set_warning.emit(message)
+
+    def on_ls(self, microbit_files):
+        """
+        Displays a list of the files on the seeed board.
+
+        Since listing files is always the final event in any interaction
+        between Mu and the seeed board, this enables the controls again for
+        further interactions to take place.
+        """
+        self.microbit_fs.clear()
+        for f in microbit_files:
+            self.microbit_fs.addItem(f)
+        # The local tree's model follows the file system by itself, so it
+        # never needs rebuilding here.
+        self.enable()
+
+    def on_ls_fail(self):
+        """
+        Fired when listing files fails.
+        """
+        self.show_warning(_("There was a problem getting the list of files on "
+                            "the device. Please check Mu's logs for "
+                            "technical information. Alternatively, try "
+                            "unplugging/plugging-in your device and/or "
+                            "restarting Mu."))
+        self.disable()
+
+    def on_put_fail(self, filename):
+        """
+        Fired when the referenced file cannot be copied onto the device.
+        """
+        self.show_warning(_("There was a problem copying the file '{}' onto "
+                            "the device. Please check Mu's logs for "
+                            "more information.").format(filename))
+        self.enable()
+
+    def on_put_no_space(self, filename):
+        """
+        Fired when the referenced file is too big for the space left on the
+        device.
+        """
+        msg = "Fail! target device doesn't have enough space."
+        logger.info(msg)
+        self.show_message(msg)
+        self.enable()
+
+    def on_delete_fail(self, filename):
+        """
+        Fired when a deletion on the device for the given file failed.
+        """
+        self.show_warning(_("There was a problem deleting '{}' from the "
+                            "device. Please check Mu's logs for "
+                            "more information.").format(filename))
+
+    def on_get_fail(self, filename):
+        """
+        Fired when getting the referenced file on the device failed.
+        """
+        self.show_warning(_("There was a problem getting '{}' from the "
+                            "device. Please check Mu's logs for "
+                            "more information.").format(filename))
+
+    def set_theme(self, theme):
+        pass
+
+    def set_font_size(self, new_size=DEFAULT_FONT_SIZE):
+        """
+        Sets the font size for all the textual elements in this pane.
+        """
+        self.font.setPointSize(new_size)
+        self.microbit_label.setFont(self.font)
+        self.local_label.setFont(self.font)
+        self.microbit_fs.setFont(self.font)
+        self.local_fs.setFont(self.font)
+
+    def set_zoom(self, size):
+        """
+        Set the current zoom level given the "t-shirt" size.
+        """
+        self.set_font_size(PANE_ZOOM_SIZES[size])
+
+
+class SeeedFileManager(FileManager):
+    """
+    A FileManager that checks the board has room for a file before copying
+    it over.
+    """
+
+    # Emitted when the referenced file is too big for the space left on the
+    # device.
+    on_put_no_space = pyqtSignal(str)
+
+    def on_start(self):
+        """
+        Open the connection to the device and list its files, then ask the
+        USB serial driver not to hold back small replies (16ms by default
+        with FTDI adapters on Linux).
+        """
+        super().on_start()
+        try:
+            self.serial.set_low_latency_mode(True)
+        except (IOError, ValueError, AttributeError) as ex:
+            logger.info(ex)
+
+    def on_stop(self):
+        """
+        Close the connection to the device and schedule this object for
+        deletion on the thread it lives on.
+        """
+        serial = getattr(self, 'serial', None)
+        if serial is not None:
+            serial.close()
+        self.deleteLater()
+
+    def put(self, local_filename):
+        """
+        Put the referenced local file onto the device if there is enough
+        free space for it, otherwise emit on_put_no_space.
+        """
+        try:
+            # Let the board multiply the fragment size by the number of free
+            # blocks so only a single integer comes back. One expression, so
+            # nothing is left behind in the board's REPL namespace.
+            out, err = execute([
+                'import os',
+                'print(os.statvfs(\'/\')[1] * os.statvfs(\'/\')[4], end=\'\')',
+            ], self.serial)
+            available = int(out)
+        except Exception as ex:
+            logger.error(ex)
+            self.on_put_fail.emit(local_filename)
+            return
+        if available > os.path.getsize(local_filename):
+            super().put(local_filename)
+        else:
+            self.on_put_no_space.emit(local_filename)
+
+
+def strptime(value):
+    """
+    Parse a 'YYYY-M-D' version string, with or without zero padding as the
+    Seeed configs and firmware banners leave it out. Splitting on '-' is
+    much cheaper than datetime.strptime and still raises ValueError on
+    malformed input.
+    """
+    parts = value.split('-')
+    if len(parts) != 3:
+        raise ValueError('invalid version: %r' % value)
+    year, month, day = (int(part) for part in parts)
+    return datetime.datetime(year, month, day)
+
+
+def download(des_path, source_path, timeout=5, try_time=3, sha256=None):
+    tmp = des_path + '.tmp'
+    # The ETag / Last-Modified validators of the last download are kept
+    # next to the file so the server can answer "304 Not Modified" instead
+    # of sending the same body again.
+    validators_path = des_path + '.etag'
+    headers = {}
+
+    if os.path.exists(des_path) and os.path.exists(validators_path):
+        try:
+            with open(validators_path, 'rb') as f:
+                headers = json_loads(f.read())
+        except Exception as ex:
+            logger.error(ex)
+
+    for i in range(0, try_time):
+        try:
+            get = http_session().get(source_path, headers=headers,
+                                     timeout=timeout, stream=True)
+            get.raise_for_status()
+            if get.status_code == 304:
+                get.close()
+                logger.info('%s not modified.', des_path)
+                return True
+            get.raw.decode_content = True
+            digest = hashlib.sha256()
+            # Hash while writing so the body never has to be read back.
+            with get, open(tmp, 'wb') as file:
+                for block in iter(lambda: get.raw.read(1024 * 1024), b''):
+                    digest.update(block)
+                    file.write(block)
+            if sha256 is not None and digest.hexdigest() != sha256.lower():
+                os.remove(tmp)
+                raise ValueError('%s checksum mismatch.' % source_path)
+            os.replace(tmp, des_path)
+            validators = {}
+            if 'ETag' in get.headers:
+                validators['If-None-Match'] = get.headers['ETag']
+            if 'Last-Modified' in get.headers:
+                validators['If-Modified-Since'] = get.headers['Last-Modified']
+            with open(validators_path, 'wb') as f:
+                f.write(json_dumps(validators))
+            logger.info('%s downloaded.', des_path)
+            return True
+        except Exception as ex:
+            logger.error(ex)
+    return False
+
+
+def download_bytes(source_path, timeout=5, try_time=3):
+    for i in range(0, try_time):
+        try:
+            get = http_session().get(source_path, timeout=timeout)
+            get.raise_for_status()
+            return get.content
+        except Exception as ex:
+            logger.error(ex)
+    return None
+
+
+class FirmwareUpdater(QThread):
+    show_status = pyqtSignal(str, float)
+    confirm = pyqtSignal(ConfirmFlag)
+    show_message_box = pyqtSignal(str)
+    set_all_button = pyqtSignal(bool)
+    in_bootload_mode = False
+    need_confirm = True
+    flash_process = None
+    hint_flashing = 'Flashing...'
+    hint_flashing_success = 'Flashing success.'
+    hint_flashing_fail = 'Flashing fail.'
+    # Seconds during which a downloaded board config is trusted without
+    # asking the server again.
+    config_check_interval = 10 * 60
+
+    def __init__(
+            self,
+            mu_code_path,
+            confirm,
+            show_status,
+            show_message_box,
+            set_all_button,
+            parent=None):
+        super(FirmwareUpdater, self).__init__(parent)
+        self.mu_code_path = mu_code_path
+        self.config_checked = {}
+        # Guards flash_process, which cancel_flashing() reads from the UI
+        # thread.
+        self.flash_lock = threading.Lock()
+        # Set whenever a device is plugged in.
+        self.detected = threading.Event()
+        self.confirm.connect(confirm)
+        self.show_status.connect(show_status)
+        self.show_message_box.connect(show_message_box)
+        self.set_all_button.connect(set_all_button)
+
+    def run(self):
+        self.update_lib()
+        while True:
+            self.detected.wait()
+            self.detected.clear()
+            self.update()
+
+    def show_status_short_time(self, msg):
+        self.show_status.emit(msg, 5)
+
+    def show_status_always(self, msg):
+        self.show_status.emit(msg, 1000 * 1000)
+
+    def update_lib(self):
+        self.extract()
+        lib = download_bytes(self.info.cloud_libaray_info_path)
+        if lib is None:
+            print('network error')
+            return
+
+        lib = json_loads(lib)
+        network_error = 'libaray update failure, please check your network.'
+
+        # check new
+        pending = []
+        for new in lib:
+            new_nam = new['name']
+            new_ver = new['version']
+
+            if new_nam not in self.info.lib_dic.keys():
+                self.show_status_always('downloading %s...' % new_nam)
+            elif strptime(new_ver) > strptime(self.info.lib_dic[new_nam]):
+                self.show_status_always('updating %s...' % new_nam)
+            else:
+                continue
+            pending.append(new)
+
+        if not pending:
+            return
+
+        def fetch(new):
+            return download(self.info.path(new['name']), new['path'],
+                            timeout=16)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            if not all(executor.map(fetch, pending)):
+                self.show_status_short_time(network_error)
+                return
+
+        for new in pending:
+            new_nam = new['name']
+            self.show_status_always('extracting %s...' % new_nam)
+
+            if not self.unzip(new_nam):
+                self.show_status_short_time('%s extract failure' % new_nam)
+                return
+
+        # Write a new dict rather than changing the cached one in place, then
+        # rebuild the tables so lib_dic and lib_name_set list the new libs.
+        inf = dict(self.info._info_cache, lib=lib)
+        with open(self.info.info_path, 'wb') as f:
+            f.write(json_dumps(inf))
+            print('lib has been updated successfully!')
+        self.info.load_info(reload=True)
+        self.show_status_short_time('libaray update successfully!')
+
+    def extract(self):
+        # extract to mu_code dir
+        for lib in self.info._info_cache['lib']:
+            self.unzip(lib['name'])
+
+    def unzip(self, lib_zip_name):
+        lib_path_zip = self.info.path(lib_zip_name)
+        lib_path_mu_code = os.path.join(
+            self.mu_code_path,
+            lib_zip_name.replace('.zip', '')
+        )
+
+        print('mu_code =', lib_path_mu_code)
+        print('lib_path_zip =', lib_path_zip)
+
+        try:
+            if not os.path.exists(lib_path_mu_code):
+                with zipfile.ZipFile(lib_path_zip, 'r') as zf:
+                    zf.extractall(lib_path_mu_code)
+                print('unzip circuitpython-bundle to mu_code dir')
+            return True
+        except Exception as ex:
+            if os.path.exists(lib_path_mu_code):
+                shutil.rmtree(lib_path_mu_code)
+            print(ex)
+            return False
+
+    def flashing(self):
+        # Relay bossac's output as it runs so progress shows in the status
+        # bar. universal_newlines turns its carriage-return progress updates
+        # into separate lines.
+        try:
+            process = subprocess.Popen(
+                self.info.bossac_argv,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                bufsize=1)
+        except OSError as ex:
+            # A missing bossac, or one without its executable bit.
+            logger.error(ex)
+            return False
+        with self.flash_lock:
+            self.flash_process = process
+        for line in process.stdout:
+            line = line.strip()
+            if line:
+                self.show_status_always(line)
+        returncode = process.wait()
+        with self.flash_lock:
+            self.flash_process = None
+        return returncode == 0
+
+    def cancel_flashing(self):
+        """
+        Stop a running bossac, in which case flashing() reports a failure.
+        Safe to call from any thread.
+        """
+        with self.flash_lock:
+            if self.flash_process is not None:
+                logger.info('Stopping bossac.')
+                self.flash_process.terminate()
+
+    def on_put(self, file):
+        msg = "'%s' successfully copied to seeed board." % file
+        self.set_message.emit(msg)
+        self.list_files.emit()
+
+    def on_delete(self, file):
+        msg = "'%s' successfully deleted from seeed board." % file
+        self.set_message.emit(msg)
+        self.list_files.emit()
+
+    def download_to_board(
+            self,
+            new_version,
+            need_update=True,
+            has_seeed_firmware=False):
+        if self.need_confirm:
+            flag = ConfirmFlag()
+            if has_seeed_firmware:
+                flag.hint = 'there is a new available firmware, ' + \
+                    'would you like to update it to you board ?'
+            elif self.in_bootload_mode:
+                flag.hint = 'your board on bootload download mode, ' + \
+                    'would you like to flashing a firmware ?'
+            else:
+                flag.hint = 'there is no firmware in your board, ' + \
+                    'would you like to flashing a firmware ?'
+            self.confirm.emit(flag)
+
+            if not flag.is_confirm:
+                return
+        elif not self.in_bootload_mode:
+            self.set_all_button.emit(True)
+            return
+        else:
+            self.need_confirm = True
+
+        self.set_all_button.emit(False)
+
+        if not self.in_bootload_mode:
+            print('setting baud rate...')
+            stty = self.info.stty_argv(1200)
+            if stty is None:
+                logger.info('Setting the baud rate is not supported.')
+            else:
+                try:
+                    subprocess.run(stty)
+                except OSError as ex:
+                    # The board won't reset into its bootloader, so no
+                    # flash follows to turn the buttons back on.
+                    logger.error(ex)
+                    self.set_all_button.emit(True)
+                    return
+            self.need_confirm = False
+            return
+
+        self.show_status_always(self.hint_flashing)
+        if self.flashing():
+            version = 'your board update to version %d.%d.%d sucessfully!' % \
+                (new_version.year, new_version.month, new_version.day)
+            self.show_message_box.emit(version)
+            self.show_status_short_time(self.hint_flashing_success)
+            self.has_firmware = True
+        else:
+            self.show_status_short_time(self.hint_flashing_fail)
+            self.show_status_short_time('flashing fail.')
+        self.set_all_button.emit(True)
+
+    def read_banner(self, com, timeout=400, limit=200):
+        """
+        Collect what the board sends back until the prompt after an Ardupy
+        banner arrives, until limit bytes have been read, or until nothing
+        has arrived for timeout milliseconds.
+
+        Runs a local event loop woken by readyRead, so the thread returns
+        as soon as the board has answered rather than polling the port.
+        """
+        buf = bytearray()
+        loop = QEventLoop()
+        timer = QTimer()
+        timer.setSingleShot(True)
+        timer.timeout.connect(loop.quit)
+
+        def on_ready_read():
+            buf.extend(bytes(com.readAll()))
+            if len(buf) >= limit or \
+                    (b'; Ardupy with seeed' in buf and buf.endswith(b'>>> ')):
+                loop.quit()
+            else:
+                # Keep waiting while the board is still talking.
+                timer.start(timeout)
+
+        com.readyRead.connect(on_ready_read)
+        timer.start(timeout)
+        loop.exec_()
+        timer.stop()
+        com.readyRead.disconnect(on_ready_read)
+        return buf
+
+    def update(self):
+        need_update = True
+        has_seeed_firmware = True
+
+        if self.need_confirm:
+            print("download config.")
+            if os.path.exists(self.info.config_path):
+                self.info.load_config()
+                old_version = self.info.version
+            else:
+                old_version = datetime.datetime(2000, 1, 1)
+
+            checked = self.config_checked.get(self.info.board_id)
+            if checked is not None and \
+                    time.monotonic() - checked < self.config_check_interval:
+                logger.info('%s is up to date.', self.info.config_path)
+                new_version = old_version
+            elif download(self.info.config_path,
+                          self.info.cloud_config_path):
+                print('finished download')
+                self.config_checked[self.info.board_id] = time.monotonic()
+                self.info.load_config()
+                new_version = self.info.version
+
+                if old_version < new_version and \
+                        not os.path.exists(self.info.local_firmware):
+                    print("download firmware.")
+                    success = download(
+                        self.info.local_firmware,
+                        self.info.cloud_firmware,
+                        timeout=16,
+                        sha256=self.info.firmware_sha256
+                    )
+                    if not success:
+                        print("download failure.")
+                    else:
+                        print("finish download.")
+            else:
+                new_version = old_version
+        else:
+            self.info.load_config()
+            new_version = self.info.version
+
+        if self.in_bootload_mode:
+            self.download_to_board(new_version)
+            return
+
+        for i in range(3):
+            com = QSerialPort()
+            com.setBaudRate(115200)
+            com.setPortName(self.info.board_name)
+            if not com.open(QSerialPort.ReadWrite):
+                print("can't open com, waiting...")
+                time.sleep(5)
+                continue
+            # Interrupt anything running, then leave raw REPL so the board
+            # prints its banner, in a single write.
+            com.write(b'\x03\x03\x02')
+            com.flush()
+            buf = self.read_banner(com)
+            try:
+                tmp = str(buf, 'utf-8')
+                print(tmp)
+                r = tmp.index('; Ardupy with seeed')
+                ver = tmp[r - 10:r]
+                need_update = new_version > strptime(ver)
+                print(ver)
+                self.info.has_firmware = True
+            except Exception as ex:
+                print(ex)
+                has_seeed_firmware = False
+            if com.isOpen():
+                com.close()
+                print('com close')
+            if not need_update:
+                print('has latest firmware.')
+            else:
+                self.download_to_board(
+                    new_version,
+                    need_update,
+                    has_seeed_firmware)
+            return
+        print("giveup")
+
+
+# Messages shown when the REPL, plotter and file system are toggled while
+# another of them holds the serial connection. The lambdas put off calling
+# _() until the locale has been set up.
+CONFLICT_MESSAGES = {
+    'repl_fs': lambda: (
+        _("REPL and file system cannot work at the same time."),
+        _("The REPL and file system both use the same USB "
+          "serial connection. Only one can be active "
+          "at any time. Toggle the file system off and "
+          "try again.")),
+    'plotter_fs': lambda: (
+        _("The plotter and file system cannot work at the same "
+          "time."),
+        _("The plotter and file system both use the same "
+          "USB serial connection. Only one can be active "
+          "at any time. Toggle the file system off and "
+          "try again.")),
+    'fs_repl': lambda: (
+        _("File system cannot work at the same time as the "
+          "REPL or plotter."),
+        _("The file system and the REPL and plotter "
+          "use the same USB serial connection. Toggle the "
+          "REPL and plotter off and try again.")),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def conflict_message(key):
+    """
+    Return the translated (message, information) pair for the referenced
+    conflict, translating it only the first time it is needed.
+    """
+    return CONFLICT_MESSAGES[key]()
+
+
+class SeeedMode(MicroPythonMode):
+    """
+    Represents the functionality required for running MicroPython on Seeed's
+    line of boards
+    """
+    name = _('Seeed MicroPython')
+    description = _("Use MicroPython on Seeed's line of boards.")
+    icon = 'seeed'
+    fs = None
+    file_manager = None
+    file_manager_thread = None
+    # Queued to the current file manager on its own thread.
+    start_file_manager = pyqtSignal()
+    stop_file_manager = pyqtSignal()
+    # Send scripts in one write via the REPL's paste mode. Set to False for
+    # firmware without paste mode to send them line by line in raw mode.
+    paste_mode = True
+    # Loaded by the first SeeedMode instance rather than on import.
+    _info = None
+
+    @classmethod
+    def _get_info(cls):
+        if cls._info is None:
+            cls._info = Info()
+        return cls._info
+
+    def __init__(self, editor, view):
+        super().__init__(editor, view)
+        self.info = SeeedMode._get_info()
+        self._firmware_ok = False
+        # File managers that have been asked to stop, kept alive until their
+        # own thread has deleted them.
+        self._stopping_file_managers = set()
+        # There are many boards which use ESP microcontrollers but they often
+        # use the same USB / serial chips (which actually define the Vendor ID
+        # and Product ID for the connected devices.
+
+        # VID  , PID
+        self.valid_boards = frozenset(self.info.board_normal +
+                                      self.info.board_boot)
+        self.invoke = FirmwareUpdater(
+            mu_code_path=super().workspace_dir(),  # mu_code/
+            confirm=self.__confirm,
+            show_status=self.editor.show_status_message,
+            show_message_box=self.__show_message_box,
+            set_all_button=self.__set_all_button
+        )
+        self.invoke.info = self.info
+        self.invoke.start()
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.__on_quit)
+        self.view.default_pane = SeeedFileSystemPane
+        LocalFileTree.info = self.info
+        editor.detect_new_device_handle = \
+            self.__asyc_detect_new_device_handle
+
+    def __on_quit(self):
+        # Don't leave bossac or the file manager thread running once Mu has
+        # gone.
+        self.invoke.cancel_flashing()
+        if self.file_manager_thread is not None:
+            self.file_manager_thread.quit()
+            self.file_manager_thread.wait()
+
+    def __set_all_button(self, state):
+        print('button Enable=' + str(state))
+        self.set_buttons(files=state, run=state, repl=state, plotter=state)
+
+    def __confirm(self, flag):
+        flag.confirm = QMessageBox.Ok == \
+            self.view.show_confirmation(flag.hint, icon='Question')
+
+    def __show_message_box(self, text):
+        self.msg = QMessageBox()
+        self.msg.setWindowTitle('Hint')
+        self.msg.setDefaultButton(self.msg.Ok)
+        self.msg.setText(text)
+        self.msg.show()
+
+    def __asyc_detect_new_device_handle(self, device_name):
+        self._firmware_ok = False
+        self.info.has_firmware = False
+        self.info.board_id = None
+        self.info.board_name = device_name
+        available_ports = QSerialPortInfo.availablePorts()
+
+        for port in available_ports:
+            pvid = (
+                port.vendorIdentifier(),
+                port.productIdentifier()
+            )
+            kind = self.info.board_kind.get(pvid)
+            if kind is not None:
+                self.info.board_id = pvid
+                self.invoke.in_bootload_mode = kind == 'boot'
+                logger.info('Detected a board in %s mode.', kind)
+                break
+
+        self.invoke.detected.set()
+
+    def actions(self):
+        """
+        Return an ordered list of actions provided by this module. An action
+        is a name (also used to identify the icon) , description, and handler.
+        """
+        buttons = [
+            {
+                'name': 'run',
+                'display_name': _('Run'),
+                'description': _("Run your code directly on the Seeed's"
+                                 " line of boards. via the REPL."),
+                'handler': self.run,
+                'shortcut': 'F5',
+            },
+            {
+                'name': 'files',
+                'display_name': _('Files'),
+                'description': _("Access the file system on "
+                                 "Seeed's line of boards."),
+                'handler': self.toggle_files,
+                'shortcut': 'F4',
+            },
+            {
+                'name': 'repl',
+                'display_name': _('REPL'),
+                'description': _("Use the REPL to live-code on the "
+                                 "Seeed's line of boards."),
+                'handler': self.toggle_repl,
+                'shortcut': 'Ctrl+Shift+I',
+            }, ]
+        if CHARTS:
+            buttons.append({
+                'name': 'plotter',
+                'display_name': _('Plotter'),
+                'description': _('Plot incoming REPL data.'),
+                'handler': self.toggle_plotter,
+                'shortcut': 'CTRL+Shift+P',
+            })
+        return buttons
+
+    def api(self):
+        """
+        Return a list of API specifications to be used by auto-suggest and call
+        tips.
+        """
+        return SHARED_APIS + SEEED_APIS
+
+    def check_firmware_existence(self):
+        if self._firmware_ok:
+            return True
+        hint = 'denit! please make sure your board connected to ' + \
+            'the computer and there is a Ardupy firmware in your board.'
+        if self.info.has_firmware:
+            self._firmware_ok = True
+            return True
+        self.__show_message_box(hint)
+        return False
+
+    def toggle_repl(self, event):
+        if not self.check_firmware_existence():
+            return
+        if self.fs is None:
+            if self.repl:
+                # Remove REPL
+                super().toggle_repl(event)
+                self.set_buttons(files=True)
+            elif not (self.repl):
+                # Add REPL
+                super().toggle_repl(event)
+                if self.repl:
+                    self.set_buttons(files=False)
+        else:
+            message, information = conflict_message('repl_fs')
+            self.view.show_message(message, information)
+
+    def toggle_plotter(self, event):
+        """
+        Check for the existence of the file pane before toggling plotter.
+        """
+        if not self.check_firmware_existence():
+            return
+        if self.fs is None:
+            super().toggle_plotter(event)
+            if self.plotter:
+                self.set_buttons(files=False)
+            elif not (self.repl or self.plotter):
+                self.set_buttons(files=True)
+        else:
+            message, information = conflict_message('plotter_fs')
+            self.view.show_message(message, information)
+
+    def run(self):
+        """
+        Takes the currently active tab, compiles the Python script therein into
+        a hex file and flashes it all onto the connected device.
+        """
+        logger.info('Running script.')
+        # Grab the Python script.
+        tab = self.view.current_tab
+        if tab is None:
+            # There is no active text editor.
+            message = _("Cannot run anything without any active editor tabs.")
+            information = _("Running transfers the content of the current tab"
+                            " onto the device. It seems like you don't have "
+                            " any tabs open.")
+            self.view.show_message(message, information)
+            return
+        if not self.repl:
+            self.toggle_repl(None)
+        if self.repl:
+            script_text = tab.text()
+            if self.paste_mode:
+                # Ctrl-C stops anything running, Ctrl-E enters paste mode and
+                # Ctrl-D leaves it, running the whole script sent in between.
+                script = script_text.replace('\n', '\r').encode('utf-8')
+                self.view.repl_pane.send_bulk(b'\x03\x05' + script + b'\x04')
+            else:
+                self.view.repl_pane.send_commands(script_text)
+
+    def toggle_files(self, event):
+        """
+        Check for the existence of the REPL or plotter before toggling the file
+        system navigator for the MicroPython device on or off.
+        """
+        if not self.check_firmware_existence():
+            return
+        if self.repl:
+            message, information = conflict_message('fs_repl')
+            self.view.show_message(message, information)
+        else:
+            if self.fs is None:
+                self.add_fs()
+                if self.fs:
+                    logger.info('Toggle filesystem on.')
+                    self.set_buttons(run=False, repl=False, plotter=False)
+            else:
+                self.remove_fs()
+                logger.info('Toggle filesystem off.')
+                self.set_buttons(run=True, repl=True, plotter=True)
+
+    def add_fs(self):
+        """
+        Add the file system navigator to the UI.
+        """
+
+        # Find serial port boards is connected to
+        device_port, serial_number = self.find_device()
+
+        # Check for MicroPython device
+        if not device_port:
+            message = _("Could not find an attached Seeed's line of boards.")
+            information = _("Please make sure the device is plugged "
+                            "into this computer.\n\nThe device must "
+                            "have MicroPython flashed onto it before "
+                            "the file system will work.\n\n"
+                            "Finally, press the device's reset button "
+                            "and wait a few seconds before trying "
+                            "again.")
+            self.view.show_message(message, information)
+            return
+
+        # The thread is started once and then kept for every file manager
+        # created afterwards, rather than spawning a new one per toggle.
+        if self.file_manager_thread is None:
+            self.file_manager_thread = QThread(self)
+        self.file_manager = SeeedFileManager(device_port)
+        self.file_manager.moveToThread(self.file_manager_thread)
+        # Queued onto the file manager's thread, so opening the port and
+        # listing the files never blocks the UI.
+        self.start_file_manager.connect(self.file_manager.on_start)
+        self.stop_file_manager.connect(self.file_manager.on_stop)
+        self.fs = self.view.add_filesystem(self.workspace_dir(),
+                                           self.file_manager,
+                                           _("Seeed's line of boards"))
+        self.fs.set_message.connect(self.editor.show_status_message)
+        self.fs.set_warning.connect(self.view.show_message)
+        self.file_manager.on_put_no_space.connect(self.fs.on_put_no_space)
+        if not self.file_manager_thread.isRunning():
+            self.file_manager_thread.start()
+        self.start_file_manager.emit()
+
+    def remove_fs(self):
+        """
+        Remove the file system navigator from the UI.
+        """
+        self.view.remove_filesystem()
+        file_manager = self.file_manager
+        if file_manager is not None:
+            # Release the port from the file manager's own thread, after
+            # anything it still has queued, so it is free to open again.
+            # The manager has no parent, so hold on to it until on_stop has
+            # deleted it there; dropping the last reference here would
+            # delete it on this thread before the queued call runs.
+            self._stopping_file_managers.add(file_manager)
+            file_manager.destroyed.connect(
+                lambda obj=None: self._stopping_file_managers.discard(
+                    file_manager))
+            self.start_file_manager.disconnect()
+            self.stop_file_manager.emit()
+            self.stop_file_manager.disconnect()
+        self.file_manager = None
+        self.fs = None
+        self._firmware_ok = False
+
+    def on_data_flood(self):
+        """
+        Ensure the Files button is active before the REPL is killed off when
+        a data flood of the plotter is detected.
+        """
+        self._firmware_ok = False
+        self.set_buttons(files=True)
+        super().on_data_flood()
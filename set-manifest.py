@@ -1,25 +1,41 @@
 import os
+import pathlib
 import platform
-inc = '''
-include mu/*
-include README.rst
-include CHANGES.rst
-include LICENSE
-include conf/*
-include mu/resources/css/*
-include mu/resources/images/*
-include mu/resources/fonts/*
-include mu/resources/pygamezero/*
-include mu/resources/seeed/*
-include run.py
-recursive-include mu/locale *
-'''
-file = open('MANIFEST.in', 'w')
-if os.name == 'posix':
-    if platform.uname().system == 'Darwin':
-        file.write('include mu/resources/seeed/tools-darwin/*' + inc)
+
+MANIFEST_BASE = (
+    'include mu/*',
+    'include README.rst',
+    'include CHANGES.rst',
+    'include LICENSE',
+    'include conf/*',
+    'include mu/resources/css/*',
+    'include mu/resources/images/*',
+    'include mu/resources/fonts/*',
+    'include mu/resources/pygamezero/*',
+    'include mu/resources/seeed/*',
+    'include run.py',
+    'recursive-include mu/locale *',
+)
+
+# Keyed by (os.name, platform system); the system is ignored on Windows.
+PLATFORM_INCLUDES = {
+    ('posix', 'Darwin'): 'include mu/resources/seeed/tools-darwin/*',
+    ('posix', 'Linux'): 'include mu/resources/seeed/tools-linux/*',
+    ('nt', None): 'include mu/resources/seeed/tools-win/*',
+}
+
+
+def write(filename='MANIFEST.in'):
+    if os.name == 'posix':
+        key = ('posix', platform.uname().system)
+        # Other unixes share the Linux bossac / stty tooling.
+        if key not in PLATFORM_INCLUDES:
+            key = ('posix', 'Linux')
     else:
-        file.write('include mu/resources/seeed/tools-posix/*' + inc)
-elif os.name == 'nt':
-    file.write('include mu/resources/seeed/tools-win/*' + inc)
-file.close()
+        key = ('nt', None)
+    lines = (PLATFORM_INCLUDES[key],) + MANIFEST_BASE
+    pathlib.Path(filename).write_text('\n'.join(lines) + '\n')
+
+
+if __name__ == '__main__':
+    write()
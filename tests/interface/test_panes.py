@@ -478,6 +478,31 @@ def test_MicroPythonREPLPane_send_commands():
     rp.execute.assert_called_once_with(expected)
 
 
+def test_MicroPythonREPLPane_send_commands_string():
+    """
+    Ensure a script passed as a single string is split into lines and sent
+    the same way as a list of commands.
+    """
+    mock_serial = mock.MagicMock()
+    rp = mu.interface.panes.MicroPythonREPLPane(mock_serial)
+    rp.execute = mock.MagicMock()
+    rp.send_commands("import os\nprint(os.listdir())")
+    sent = rp.execute.call_args[0][0]
+    assert b'import os\r' in sent
+    assert b'print(os.listdir())\r' in sent
+
+
+def test_MicroPythonREPLPane_send_bulk():
+    """
+    Ensure the payload is sent to the device in one write and flushed.
+    """
+    mock_serial = mock.MagicMock()
+    rp = mu.interface.panes.MicroPythonREPLPane(mock_serial)
+    rp.send_bulk(b'\x05import os\r\x04')
+    mock_serial.write.assert_called_once_with(b'\x05import os\r\x04')
+    mock_serial.flush.assert_called_once_with()
+
+
 def test_MicroPythonREPLPane_execute():
     """
     Ensure the first command is sent via serial to the connected device, and
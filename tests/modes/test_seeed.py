@@ -0,0 +1,859 @@
+# -*- coding: utf-8 -*-
+import datetime
+import hashlib
+import json
+import os
+import pytest
+import threading
+from unittest import mock
+from mu.modes.seeed import SeeedMode, SeeedFileManager, FirmwareUpdater, \
+    ConfirmFlag, Info, download, http_session, load_boards, strptime
+
+
+@pytest.fixture
+def seeed_mode():
+    editor = mock.MagicMock()
+    view = mock.MagicMock()
+    # A fresh Info for each test, so changes to it don't leak between them.
+    with mock.patch('mu.modes.seeed.SeeedMode._info', None), \
+            mock.patch('mu.modes.seeed.FirmwareUpdater'):
+        seeed_mode = SeeedMode(editor, view)
+    return seeed_mode
+
+
+@pytest.fixture
+def updater():
+    updater = FirmwareUpdater(mu_code_path='mu_code',
+                              confirm=mock.MagicMock(),
+                              show_status=mock.MagicMock(),
+                              show_message_box=mock.MagicMock(),
+                              set_all_button=mock.MagicMock())
+    updater.info = mock.MagicMock()
+    updater.show_status = mock.MagicMock()
+    updater.show_message_box = mock.MagicMock()
+    updater.set_all_button = mock.MagicMock()
+    return updater
+
+
+@mock.patch('mu.modes.seeed.QThread')
+@mock.patch('mu.modes.seeed.SeeedFileManager')
+def test_add_fs(fm, qthread, seeed_mode):
+    """
+    The file manager is started on its own thread via a queued signal rather
+    than being called directly from the UI thread.
+    """
+    seeed_mode.find_device = mock.MagicMock(return_value=('COM0', '12345'))
+    seeed_mode.start_file_manager = mock.MagicMock()
+    seeed_mode.stop_file_manager = mock.MagicMock()
+    qthread.return_value.isRunning.return_value = False
+    seeed_mode.add_fs()
+    file_manager = seeed_mode.file_manager
+    file_manager.moveToThread.assert_called_once_with(qthread.return_value)
+    seeed_mode.start_file_manager.connect.assert_called_once_with(
+        file_manager.on_start)
+    seeed_mode.stop_file_manager.connect.assert_called_once_with(
+        file_manager.on_stop)
+    qthread.return_value.start.assert_called_once_with()
+    seeed_mode.start_file_manager.emit.assert_called_once_with()
+    file_manager.on_start.assert_not_called()
+    assert seeed_mode.fs
+
+
+@mock.patch('mu.modes.seeed.QThread')
+@mock.patch('mu.modes.seeed.SeeedFileManager')
+def test_add_fs_reuses_thread(fm, qthread, seeed_mode):
+    """
+    A running file manager thread is reused rather than started again.
+    """
+    seeed_mode.find_device = mock.MagicMock(return_value=('COM0', '12345'))
+    seeed_mode.start_file_manager = mock.MagicMock()
+    seeed_mode.stop_file_manager = mock.MagicMock()
+    thread = mock.MagicMock()
+    thread.isRunning.return_value = True
+    seeed_mode.file_manager_thread = thread
+    seeed_mode.add_fs()
+    assert qthread.call_count == 0
+    assert thread.start.call_count == 0
+    seeed_mode.start_file_manager.emit.assert_called_once_with()
+
+
+def test_remove_fs(seeed_mode):
+    """
+    Removing the file system asks the file manager to close its connection
+    on its own thread and stops it from being started again.
+    """
+    file_manager = mock.MagicMock()
+    seeed_mode.fs = True
+    seeed_mode.file_manager = file_manager
+    seeed_mode.start_file_manager = mock.MagicMock()
+    seeed_mode.stop_file_manager = mock.MagicMock()
+    seeed_mode.remove_fs()
+    assert seeed_mode.view.remove_filesystem.call_count == 1
+    seeed_mode.start_file_manager.disconnect.assert_called_once_with()
+    seeed_mode.stop_file_manager.emit.assert_called_once_with()
+    seeed_mode.stop_file_manager.disconnect.assert_called_once_with()
+    assert seeed_mode.file_manager is None
+    assert seeed_mode.fs is None
+
+
+def test_remove_fs_keeps_file_manager_until_destroyed(seeed_mode):
+    """
+    The stopped file manager stays referenced until its own thread has
+    deleted it, so the queued on_stop has an object to run on.
+    """
+    file_manager = mock.MagicMock()
+    seeed_mode.file_manager = file_manager
+    seeed_mode.start_file_manager = mock.MagicMock()
+    seeed_mode.stop_file_manager = mock.MagicMock()
+    seeed_mode.remove_fs()
+    assert file_manager in seeed_mode._stopping_file_managers
+    on_destroyed = file_manager.destroyed.connect.call_args[0][0]
+    on_destroyed(file_manager)
+    assert file_manager not in seeed_mode._stopping_file_managers
+
+
+def test_SeeedFileManager_on_start():
+    """
+    Starting the file manager lists the files and asks for low latency.
+    """
+    fm = SeeedFileManager('/dev/ttyUSB0')
+    fm.ls = mock.MagicMock()
+    with mock.patch('mu.modes.base.Serial') as mock_serial:
+        fm.on_start()
+    fm.ls.assert_called_once_with()
+    mock_serial.return_value.set_low_latency_mode.assert_called_once_with(
+        True)
+
+
+def test_SeeedFileManager_on_start_no_low_latency():
+    """
+    Serial ports without a low latency mode are still used.
+    """
+    fm = SeeedFileManager('/dev/ttyUSB0')
+    fm.ls = mock.MagicMock()
+    with mock.patch('mu.modes.base.Serial') as mock_serial:
+        mock_serial.return_value.set_low_latency_mode.side_effect = \
+            ValueError('not supported')
+        fm.on_start()
+    fm.ls.assert_called_once_with()
+
+
+def test_SeeedFileManager_on_stop():
+    """
+    Stopping the file manager closes the serial connection and schedules
+    the object for deletion.
+    """
+    fm = SeeedFileManager('/dev/ttyUSB0')
+    fm.serial = mock.MagicMock()
+    fm.deleteLater = mock.MagicMock()
+    fm.on_stop()
+    fm.serial.close.assert_called_once_with()
+    fm.deleteLater.assert_called_once_with()
+
+
+def test_SeeedFileManager_on_stop_not_started():
+    """
+    Stopping a file manager that never opened a connection still cleans up.
+    """
+    fm = SeeedFileManager('/dev/ttyUSB0')
+    fm.deleteLater = mock.MagicMock()
+    fm.on_stop()
+    fm.deleteLater.assert_called_once_with()
+
+
+def test_FirmwareUpdater_flashing_missing_bossac(updater):
+    """
+    A bossac that cannot be started counts as a failed flash.
+    """
+    with mock.patch('mu.modes.seeed.subprocess.Popen',
+                    side_effect=FileNotFoundError('bossac')):
+        assert updater.flashing() is False
+
+
+def test_FirmwareUpdater_download_to_board_flash_fails(updater):
+    """
+    The buttons are enabled again when bossac cannot be started.
+    """
+    updater.need_confirm = False
+    updater.in_bootload_mode = True
+    with mock.patch('mu.modes.seeed.subprocess.Popen',
+                    side_effect=PermissionError('bossac')):
+        updater.download_to_board(None)
+    assert updater.set_all_button.emit.call_args_list == [
+        mock.call(False), mock.call(True)]
+    assert updater.show_message_box.emit.call_count == 0
+
+
+def test_FirmwareUpdater_download_to_board_stty_fails(updater):
+    """
+    The buttons are enabled again when stty cannot be started, and the
+    user is asked again next time.
+    """
+    updater.need_confirm = True
+    updater.in_bootload_mode = False
+    updater.info.stty_argv.return_value = ['stty', '-F', 'COM0', '1200']
+    with mock.patch('mu.modes.seeed.ConfirmFlag') as flag, \
+            mock.patch('mu.modes.seeed.subprocess.run',
+                       side_effect=FileNotFoundError('stty')):
+        flag.return_value.is_confirm = True
+        updater.download_to_board(None)
+    assert updater.set_all_button.emit.call_args_list == [
+        mock.call(False), mock.call(True)]
+    assert updater.need_confirm is True
+
+
+@mock.patch('mu.modes.seeed.QTimer')
+@mock.patch('mu.modes.seeed.QEventLoop')
+def test_FirmwareUpdater_read_banner(loop, timer, updater):
+    """
+    The idle timeout is restarted each time data arrives, and reading stops
+    once the prompt after the Ardupy banner has arrived.
+    """
+    com = mock.MagicMock()
+    com.readAll.side_effect = [
+        b'MicroPython 2019-08-26',
+        b'; Ardupy with seeed\r\n>>> ',
+    ]
+
+    def exec_():
+        on_ready_read = com.readyRead.connect.call_args[0][0]
+        on_ready_read()
+        on_ready_read()
+
+    loop.return_value.exec_.side_effect = exec_
+    buf = updater.read_banner(com)
+    assert buf == b'MicroPython 2019-08-26; Ardupy with seeed\r\n>>> '
+    assert timer.return_value.start.call_args_list == [
+        mock.call(400), mock.call(400)]
+    loop.return_value.quit.assert_called_once_with()
+
+
+@mock.patch('mu.modes.seeed.QTimer')
+@mock.patch('mu.modes.seeed.QEventLoop')
+def test_FirmwareUpdater_read_banner_limit(loop, timer, updater):
+    """
+    Reading stops once the limit is reached, even if data is still coming.
+    """
+    com = mock.MagicMock()
+    com.readAll.return_value = b'x' * 150
+
+    def exec_():
+        on_ready_read = com.readyRead.connect.call_args[0][0]
+        on_ready_read()
+        on_ready_read()
+
+    loop.return_value.exec_.side_effect = exec_
+    buf = updater.read_banner(com)
+    assert len(buf) == 300
+    loop.return_value.quit.assert_called_once_with()
+
+
+def test_SeeedMode_quit():
+    """
+    Quitting Mu stops any bossac the firmware updater has running and the
+    file manager thread.
+    """
+    editor = mock.MagicMock()
+    view = mock.MagicMock()
+    with mock.patch('mu.modes.seeed.FirmwareUpdater') as fu, \
+            mock.patch('mu.modes.seeed.QApplication') as qa:
+        seeed_mode = SeeedMode(editor, view)
+    about_to_quit = qa.instance.return_value.aboutToQuit
+    assert about_to_quit.connect.call_count == 1
+    seeed_mode.file_manager_thread = mock.MagicMock()
+    about_to_quit.connect.call_args[0][0]()
+    fu.return_value.cancel_flashing.assert_called_once_with()
+    seeed_mode.file_manager_thread.quit.assert_called_once_with()
+    seeed_mode.file_manager_thread.wait.assert_called_once_with()
+
+
+def test_SeeedMode_quit_without_file_manager():
+    """
+    Quitting before the file system was ever shown still stops bossac.
+    """
+    editor = mock.MagicMock()
+    view = mock.MagicMock()
+    with mock.patch('mu.modes.seeed.FirmwareUpdater') as fu, \
+            mock.patch('mu.modes.seeed.QApplication') as qa:
+        SeeedMode(editor, view)
+    qa.instance.return_value.aboutToQuit.connect.call_args[0][0]()
+    fu.return_value.cancel_flashing.assert_called_once_with()
+
+
+def test_FirmwareUpdater_flashing(updater):
+    """
+    bossac's output is shown in the status bar as it arrives and the result
+    depends on its exit code.
+    """
+    process = mock.MagicMock()
+    process.stdout = ['Erase flash\n', '\n', '[====] 100%\n']
+    process.wait.return_value = 0
+    with mock.patch('mu.modes.seeed.subprocess.Popen',
+                    return_value=process):
+        assert updater.flashing() is True
+    assert updater.show_status.emit.call_args_list == [
+        mock.call('Erase flash', 1000 * 1000),
+        mock.call('[====] 100%', 1000 * 1000)]
+    assert updater.flash_process is None
+
+
+def test_FirmwareUpdater_cancel_flashing(updater):
+    """
+    A running bossac is terminated.
+    """
+    updater.flash_process = mock.MagicMock()
+    updater.cancel_flashing()
+    updater.flash_process.terminate.assert_called_once_with()
+
+
+def test_FirmwareUpdater_cancel_flashing_idle(updater):
+    """
+    Cancelling when nothing is being flashed does nothing.
+    """
+    updater.flash_process = None
+    updater.cancel_flashing()
+
+
+def test_SeeedFileManager_put():
+    """
+    The file is copied when the board has room for it.
+    """
+    fm = SeeedFileManager('/dev/ttyUSB0')
+    fm.serial = mock.MagicMock()
+    fm.on_put_file = mock.MagicMock()
+    fm.on_put_no_space = mock.MagicMock()
+    path = os.path.join('directory', 'foo.py')
+    with mock.patch('mu.modes.seeed.execute',
+                    return_value=(b'4096', b'')) as mock_execute, \
+            mock.patch('mu.modes.seeed.os.path.getsize', return_value=100), \
+            mock.patch('mu.modes.base.microfs.put') as mock_put:
+        fm.put(path)
+    mock_execute.assert_called_once_with([
+        'import os',
+        "print(os.statvfs('/')[1] * os.statvfs('/')[4], end='')",
+    ], fm.serial)
+    mock_put.assert_called_once_with(path, target=None, serial=fm.serial)
+    fm.on_put_file.emit.assert_called_once_with('foo.py')
+    assert fm.on_put_no_space.emit.call_count == 0
+
+
+def test_SeeedFileManager_put_no_space():
+    """
+    The on_put_no_space signal is emitted, and nothing is copied, when the
+    file is bigger than the space left on the board.
+    """
+    fm = SeeedFileManager('/dev/ttyUSB0')
+    fm.serial = mock.MagicMock()
+    fm.on_put_no_space = mock.MagicMock()
+    with mock.patch('mu.modes.seeed.execute', return_value=(b'100', b'')), \
+            mock.patch('mu.modes.seeed.os.path.getsize', return_value=4096), \
+            mock.patch('mu.modes.base.microfs.put') as mock_put:
+        fm.put('foo.py')
+    assert mock_put.call_count == 0
+    fm.on_put_no_space.emit.assert_called_once_with('foo.py')
+
+
+def test_SeeedFileManager_put_bad_reply():
+    """
+    The on_put_fail signal is emitted when the board's reply to the free
+    space query isn't a number.
+    """
+    fm = SeeedFileManager('/dev/ttyUSB0')
+    fm.serial = mock.MagicMock()
+    fm.on_put_fail = mock.MagicMock()
+    with mock.patch('mu.modes.seeed.execute',
+                    return_value=(b'', b'Traceback')), \
+            mock.patch('mu.modes.base.microfs.put') as mock_put:
+        fm.put('foo.py')
+    assert mock_put.call_count == 0
+    fm.on_put_fail.emit.assert_called_once_with('foo.py')
+
+
+def test_SeeedFileManager_put_serial_error():
+    """
+    The on_put_fail signal is emitted when the board can't be asked how much
+    space is left.
+    """
+    fm = SeeedFileManager('/dev/ttyUSB0')
+    fm.serial = mock.MagicMock()
+    fm.on_put_fail = mock.MagicMock()
+    with mock.patch('mu.modes.seeed.execute',
+                    side_effect=IOError('boom')), \
+            mock.patch('mu.modes.base.microfs.put') as mock_put:
+        fm.put('foo.py')
+    assert mock_put.call_count == 0
+    fm.on_put_fail.emit.assert_called_once_with('foo.py')
+
+
+def _response(status_code=200, body=b'', headers=None):
+    response = mock.MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.raw.read.side_effect = [body, b'']
+    return response
+
+
+def test_download_saves_validators(tmpdir):
+    """
+    A fresh download writes the file and keeps its ETag and Last-Modified
+    headers next to it for the next request.
+    """
+    des_path = str(tmpdir.join('config.json'))
+    response = _response(body=b'{}', headers={
+        'ETag': '"abc"',
+        'Last-Modified': 'Mon, 26 Aug 2019 00:00:00 GMT',
+    })
+    session = mock.MagicMock()
+    session.get.return_value = response
+    with mock.patch('mu.modes.seeed.http_session', return_value=session):
+        assert download(des_path, 'https://example.com/config.json')
+    assert session.get.call_args[1]['headers'] == {}
+    with open(des_path, 'rb') as f:
+        assert f.read() == b'{}'
+    with open(des_path + '.etag', 'rb') as f:
+        assert json.loads(f.read().decode('utf-8')) == {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Mon, 26 Aug 2019 00:00:00 GMT',
+        }
+
+
+def test_download_not_modified(tmpdir):
+    """
+    The saved validators are sent back, and a 304 reply leaves the local
+    copy alone.
+    """
+    des = tmpdir.join('config.json')
+    des.write_binary(b'old')
+    tmpdir.join('config.json.etag').write_binary(
+        json.dumps({'If-None-Match': '"abc"'}).encode('utf-8'))
+    response = _response(status_code=304)
+    session = mock.MagicMock()
+    session.get.return_value = response
+    with mock.patch('mu.modes.seeed.http_session', return_value=session):
+        assert download(str(des), 'https://example.com/config.json')
+    assert session.get.call_args[1]['headers'] == {'If-None-Match': '"abc"'}
+    response.close.assert_called_once_with()
+    assert des.read_binary() == b'old'
+
+
+def test_download_ignores_validators_without_file(tmpdir):
+    """
+    Validators are not sent when the file they describe has gone, so the
+    server always sends the body.
+    """
+    des_path = str(tmpdir.join('config.json'))
+    tmpdir.join('config.json.etag').write_binary(
+        json.dumps({'If-None-Match': '"abc"'}).encode('utf-8'))
+    session = mock.MagicMock()
+    session.get.return_value = _response(body=b'{}')
+    with mock.patch('mu.modes.seeed.http_session', return_value=session):
+        assert download(des_path, 'https://example.com/config.json')
+    assert session.get.call_args[1]['headers'] == {}
+    with open(des_path, 'rb') as f:
+        assert f.read() == b'{}'
+
+
+def test_download_sha256(tmpdir):
+    """
+    A download whose digest matches the expected sha256 is kept.
+    """
+    des_path = str(tmpdir.join('firmware.bin'))
+    body = b'firmware'
+    session = mock.MagicMock()
+    session.get.return_value = _response(body=body)
+    with mock.patch('mu.modes.seeed.http_session', return_value=session):
+        assert download(des_path, 'https://example.com/firmware.bin',
+                        sha256=hashlib.sha256(body).hexdigest().upper())
+    with open(des_path, 'rb') as f:
+        assert f.read() == body
+
+
+def test_download_sha256_mismatch(tmpdir):
+    """
+    A download whose digest doesn't match is retried, and when every attempt
+    is corrupt nothing is moved into place or left behind.
+    """
+    des_path = str(tmpdir.join('firmware.bin'))
+    session = mock.MagicMock()
+    session.get.side_effect = lambda *args, **kwargs: _response(body=b'bad')
+    with mock.patch('mu.modes.seeed.http_session', return_value=session):
+        assert not download(des_path, 'https://example.com/firmware.bin',
+                            try_time=2,
+                            sha256=hashlib.sha256(b'good').hexdigest())
+    assert session.get.call_count == 2
+    assert not os.path.exists(des_path)
+    assert not os.path.exists(des_path + '.tmp')
+    assert not os.path.exists(des_path + '.etag')
+
+
+def test_download_sha256_retry(tmpdir):
+    """
+    A corrupt first attempt is replaced by a good second one.
+    """
+    des_path = str(tmpdir.join('firmware.bin'))
+    session = mock.MagicMock()
+    session.get.side_effect = [_response(body=b'bad'),
+                               _response(body=b'good')]
+    with mock.patch('mu.modes.seeed.http_session', return_value=session):
+        assert download(des_path, 'https://example.com/firmware.bin',
+                        sha256=hashlib.sha256(b'good').hexdigest())
+    with open(des_path, 'rb') as f:
+        assert f.read() == b'good'
+
+
+def test_strptime():
+    """
+    A version becomes a datetime that compares with the default version used
+    by the firmware updater, whether or not it is zero padded.
+    """
+    version = strptime('2019-08-26')
+    assert version == datetime.datetime(2019, 8, 26)
+    assert version > datetime.datetime(2000, 1, 1)
+    assert strptime('2019-8-26') == version
+
+
+def test_strptime_banner():
+    """
+    The ten characters before '; Ardupy with seeed' in the firmware banner
+    include a leading space when the version isn't zero padded.
+    """
+    assert strptime(' 2019-8-26') == datetime.datetime(2019, 8, 26)
+
+
+def test_Info_load_config_version():
+    """
+    The version in the board config shipped with Mu can be parsed.
+    """
+    info = Info()
+    info.board_id = next(iter(info.dic_config))
+    info.load_config()
+    assert info.version == datetime.datetime(2019, 8, 26)
+
+
+def test_Info_lib_versions():
+    """
+    The library versions in the info.json shipped with Mu can be parsed.
+    """
+    info = Info()
+    for version in info.lib_dic.values():
+        assert strptime(version) > datetime.datetime(2000, 1, 1)
+
+
+@pytest.mark.parametrize('value', [
+    '',
+    '2019/08/26',
+    '2019-08',
+    '2019-08-26-01',
+    'abcd-ef-gh',
+    '2019-13-01',
+    '2019-02-30',
+])
+def test_strptime_invalid(value):
+    """
+    Anything that isn't a real YYYY-M-D date is rejected with ValueError,
+    which the firmware banner parse relies on.
+    """
+    with pytest.raises(ValueError):
+        strptime(value)
+
+
+def test_FirmwareUpdater_update_lib(updater, tmpdir):
+    """
+    New libraries are fetched, info.json is rewritten with the new list
+    without changing the cached dict, and the tables are rebuilt.
+    """
+    info_path = tmpdir.join('info.json')
+    cached = {'boot': [], 'normal': [], 'lib': []}
+    updater.info._info_cache = cached
+    updater.info.info_path = str(info_path)
+    updater.info.lib_dic = {}
+    updater.extract = mock.MagicMock()
+    updater.unzip = mock.MagicMock(return_value=True)
+    lib = [{'name': 'new.zip', 'version': '2019-8-26',
+            'path': 'https://example.com/new.zip'}]
+    with mock.patch('mu.modes.seeed.download_bytes',
+                    return_value=json.dumps(lib).encode('utf-8')), \
+            mock.patch('mu.modes.seeed.download',
+                       return_value=True) as mock_download:
+        updater.update_lib()
+    assert mock_download.call_count == 1
+    updater.unzip.assert_called_once_with('new.zip')
+    assert cached['lib'] == []
+    written = json.loads(info_path.read_binary().decode('utf-8'))
+    assert written['lib'] == lib
+    updater.info.load_info.assert_called_once_with(reload=True)
+
+
+def test_FirmwareUpdater_update_lib_download_fails(updater, tmpdir):
+    """
+    info.json is left alone when a library fails to download.
+    """
+    info_path = tmpdir.join('info.json')
+    updater.info._info_cache = {'boot': [], 'normal': [], 'lib': []}
+    updater.info.info_path = str(info_path)
+    updater.info.lib_dic = {}
+    updater.extract = mock.MagicMock()
+    updater.unzip = mock.MagicMock()
+    lib = [{'name': 'new.zip', 'version': '2019-8-26',
+            'path': 'https://example.com/new.zip'}]
+    with mock.patch('mu.modes.seeed.download_bytes',
+                    return_value=json.dumps(lib).encode('utf-8')), \
+            mock.patch('mu.modes.seeed.download', return_value=False):
+        updater.update_lib()
+    assert updater.unzip.call_count == 0
+    assert not info_path.exists()
+    assert updater.info.load_info.call_count == 0
+
+
+def test_http_session():
+    """
+    Every download shares one session, whose https adapter keeps a pool
+    of connections for the parallel library downloads.
+    """
+    with mock.patch('mu.modes.seeed._HTTP_SESSION', None):
+        session = http_session()
+        assert http_session() is session
+    adapter = session.get_adapter('https://seeed-studio.github.io/ArduPy/')
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 4
+
+
+def test_FirmwareUpdater_update_lib_several(updater, tmpdir):
+    """
+    Every new or newer library is fetched through the pool, libraries
+    already up to date are skipped, and each fetched one is extracted.
+    """
+    updater.info._info_cache = {'boot': [], 'normal': [], 'lib': []}
+    updater.info.info_path = str(tmpdir.join('info.json'))
+    updater.info.lib_dic = {'old.zip': '2019-1-1', 'same.zip': '2019-8-26'}
+    updater.info.path.side_effect = lambda name: 'seeed/' + name
+    updater.extract = mock.MagicMock()
+    updater.unzip = mock.MagicMock(return_value=True)
+    lib = [
+        {'name': name, 'version': '2019-8-26',
+         'path': 'https://example.com/' + name}
+        for name in ('new.zip', 'old.zip', 'same.zip')
+    ]
+    with mock.patch('mu.modes.seeed.download_bytes',
+                    return_value=json.dumps(lib).encode('utf-8')), \
+            mock.patch('mu.modes.seeed.download',
+                       return_value=True) as mock_download:
+        updater.update_lib()
+    assert sorted(mock_download.call_args_list) == [
+        mock.call('seeed/new.zip', 'https://example.com/new.zip',
+                  timeout=16),
+        mock.call('seeed/old.zip', 'https://example.com/old.zip',
+                  timeout=16),
+    ]
+    assert updater.unzip.call_args_list == [
+        mock.call('new.zip'), mock.call('old.zip')]
+
+
+def test_Info_load_info_reload(tmpdir):
+    """
+    Reloading rebuilds the library tables from the rewritten info.json.
+    """
+    info_path = tmpdir.join('info.json')
+    with open(Info().info_path, 'rb') as f:
+        inf = json.loads(f.read().decode('utf-8'))
+    info_path.write_binary(json.dumps(inf).encode('utf-8'))
+    with mock.patch('mu.modes.seeed.Info.info_path',
+                    new_callable=mock.PropertyMock,
+                    return_value=str(info_path)):
+        info = Info()
+        cached = info._info_cache
+        inf['lib'] = [{'name': 'new.zip', 'version': '2019-8-26',
+                       'path': 'https://example.com/new.zip'}]
+        info_path.write_binary(json.dumps(inf).encode('utf-8'))
+        info.load_info(reload=True)
+    assert info.lib_dic == {'new.zip': '2019-8-26'}
+    assert info.lib_name_set == {'new'}
+    assert info._info_cache is not cached
+
+
+def _info_json(tmpdir):
+    info_path = tmpdir.join('info.json')
+    with open(Info().info_path, 'rb') as f:
+        info_path.write_binary(f.read())
+    return info_path
+
+
+def test_Info_reuses_parsed_info_json(tmpdir):
+    """
+    Creating another Info doesn't parse an unchanged info.json again.
+    """
+    info_path = _info_json(tmpdir)
+    with mock.patch('mu.modes.seeed.Info.info_path',
+                    new_callable=mock.PropertyMock,
+                    return_value=str(info_path)), \
+            mock.patch('mu.modes.seeed.load_boards',
+                       wraps=load_boards) as mock_load:
+        first = Info()
+        second = Info()
+    assert mock_load.call_count == 1
+    assert second._info_cache is first._info_cache
+
+
+def test_Info_reparses_changed_info_json(tmpdir):
+    """
+    A change to info.json's modification time means it is parsed again.
+    """
+    info_path = _info_json(tmpdir)
+    with mock.patch('mu.modes.seeed.Info.info_path',
+                    new_callable=mock.PropertyMock,
+                    return_value=str(info_path)), \
+            mock.patch('mu.modes.seeed.load_boards',
+                       wraps=load_boards) as mock_load:
+        Info()
+        mtime = os.stat(str(info_path)).st_mtime
+        os.utime(str(info_path), (mtime + 10, mtime + 10))
+        Info()
+    assert mock_load.call_count == 2
+
+
+def test_load_boards():
+    """
+    The shipped info.json is turned into the boot / normal tables and the
+    lookups built from them.
+    """
+    inf, boot, normal, kind, config, lib = load_boards(Info().info_path)
+    assert boot == ((10374, 39), )
+    assert normal == ((9025, 32845), )
+    assert kind == {(10374, 39): 'boot', (9025, 32845): 'normal'}
+    assert config[(9025, 32845)] == 'config-ardupy-seeeduino-m0.json'
+    assert lib == {'circuitpython-bundle.zip': '2019-8-26'}
+    assert inf['lib'][0]['name'] == 'circuitpython-bundle.zip'
+
+
+def test_SeeedMode_shares_info():
+    """
+    Every SeeedMode uses the same Info, loaded when the first one is
+    created rather than on import.
+    """
+    with mock.patch('mu.modes.seeed.SeeedMode._info', None), \
+            mock.patch('mu.modes.seeed.FirmwareUpdater'), \
+            mock.patch('mu.modes.seeed.Info') as mock_info:
+        first = SeeedMode(mock.MagicMock(), mock.MagicMock())
+        second = SeeedMode(mock.MagicMock(), mock.MagicMock())
+    assert mock_info.call_count == 1
+    assert first.info is second.info is mock_info.return_value
+
+
+def test_ConfirmFlag_waits_for_answer():
+    """
+    is_confirm blocks until the UI thread sets an answer, then returns it.
+    """
+    flag = ConfirmFlag()
+    answer = threading.Timer(0.05, setattr, (flag, 'confirm', True))
+    answer.start()
+    assert flag.is_confirm is True
+    answer.join()
+
+
+def test_ConfirmFlag_already_answered():
+    """
+    An answer given before is_confirm is read is returned straight away.
+    """
+    flag = ConfirmFlag()
+    flag.confirm = False
+    assert flag.is_confirm is False
+    assert flag.confirm is False
+
+
+def test_run_paste_mode(seeed_mode):
+    """
+    The script is sent in one write, wrapped in the REPL's paste mode.
+    """
+    seeed_mode.repl = True
+    seeed_mode.view.current_tab.text.return_value = 'a = 1\nprint(a)'
+    seeed_mode.run()
+    seeed_mode.view.repl_pane.send_bulk.assert_called_once_with(
+        b'\x03\x05a = 1\rprint(a)\x04')
+    assert seeed_mode.view.repl_pane.send_commands.call_count == 0
+
+
+def test_run_raw_mode(seeed_mode):
+    """
+    Without paste mode the script goes to the REPL line by line.
+    """
+    seeed_mode.repl = True
+    seeed_mode.paste_mode = False
+    seeed_mode.view.current_tab.text.return_value = 'a = 1\nprint(a)'
+    seeed_mode.run()
+    seeed_mode.view.repl_pane.send_commands.assert_called_once_with(
+        'a = 1\nprint(a)')
+    assert seeed_mode.view.repl_pane.send_bulk.call_count == 0
+
+
+def test_run_no_tab(seeed_mode):
+    """
+    Nothing is sent when there is no editor tab to run.
+    """
+    seeed_mode.view.current_tab = None
+    seeed_mode.run()
+    assert seeed_mode.view.show_message.call_count == 1
+    assert seeed_mode.view.repl_pane.send_bulk.call_count == 0
+
+
+@mock.patch('mu.modes.seeed.QMessageBox')
+def test_check_firmware_existence_cached(mock_box, seeed_mode):
+    """
+    Once the firmware has been found, later checks don't depend on the
+    updater's flag and don't show the warning.
+    """
+    seeed_mode.info.has_firmware = True
+    assert seeed_mode.check_firmware_existence()
+    seeed_mode.info.has_firmware = False
+    assert seeed_mode.check_firmware_existence()
+    assert mock_box.call_count == 0
+
+
+@mock.patch('mu.modes.seeed.QMessageBox')
+def test_check_firmware_existence_missing(mock_box, seeed_mode):
+    """
+    Without firmware a warning is shown and nothing is remembered.
+    """
+    seeed_mode.info.has_firmware = False
+    assert not seeed_mode.check_firmware_existence()
+    assert mock_box.call_count == 1
+    assert not seeed_mode._firmware_ok
+
+
+@mock.patch('mu.modes.seeed.QSerialPortInfo')
+def test_detect_new_device_resets_firmware_check(mock_port_info, seeed_mode):
+    """
+    A newly detected device has to be checked for firmware again, and the
+    updater is told which kind of board it is.
+    """
+    port = mock.MagicMock()
+    port.vendorIdentifier.return_value = 9025
+    port.productIdentifier.return_value = 32845
+    mock_port_info.availablePorts.return_value = [port]
+    seeed_mode._firmware_ok = True
+    seeed_mode.editor.detect_new_device_handle('COM0')
+    assert not seeed_mode._firmware_ok
+    assert seeed_mode.info.board_id == (9025, 32845)
+    assert seeed_mode.info.board_name == 'COM0'
+    assert seeed_mode.invoke.in_bootload_mode is False
+    seeed_mode.invoke.detected.set.assert_called_once_with()
+
+
+def test_remove_fs_resets_firmware_check(seeed_mode):
+    """
+    Removing the file system means the firmware is checked again next time.
+    """
+    seeed_mode._firmware_ok = True
+    seeed_mode.remove_fs()
+    assert not seeed_mode._firmware_ok
+
+
+def test_on_data_flood_resets_firmware_check(seeed_mode):
+    """
+    A data flood means the firmware is checked again next time.
+    """
+    seeed_mode._firmware_ok = True
+    seeed_mode.set_buttons = mock.MagicMock()
+    with mock.patch('mu.modes.seeed.MicroPythonMode.on_data_flood'):
+        seeed_mode.on_data_flood()
+    assert not seeed_mode._firmware_ok
+    seeed_mode.set_buttons.assert_called_once_with(files=True)